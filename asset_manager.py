@@ -0,0 +1,57 @@
+import pygame
+from constants import MAIN_ASSET_PATH
+
+
+class AssetManager:
+    """Loads each image once and hands out the same surface to everything that uses it"""
+    hits = 0
+    misses = 0
+    __images = {}
+
+    @staticmethod
+    def get(name: str) -> pygame.Surface:
+        """
+        Gets an image from the resized asset directory, the surface is shared so it must not be drawn on
+        :param name: File name without the extension, e.g 'fire' for fire.png
+        :return: The loaded image
+        """
+        if name in AssetManager.__images:
+            AssetManager.hits += 1
+            return AssetManager.__images[name]
+
+        AssetManager.misses += 1
+        image = pygame.image.load(f"{MAIN_ASSET_PATH}{name}.png")
+
+        # Converting to the display pixel format makes blits faster, this can only be done once the window exists
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha() if image.get_flags() & pygame.SRCALPHA else image.convert()
+
+        AssetManager.__images[name] = image
+        return image
+
+    @staticmethod
+    def discard(name: str) -> None:
+        """
+        Removes an image from the cache, used once its pixels have been copied somewhere else e.g a sprite sheet
+        :param name: File name without the extension
+        :return: None
+        """
+        AssetManager.__images.pop(name, None)
+
+    @staticmethod
+    def stats() -> dict:
+        """
+        Gets the cache counters
+        :return: Dict of hits, misses and the number of images loaded
+        """
+        return {"hits": AssetManager.hits, "misses": AssetManager.misses, "loaded": len(AssetManager.__images)}
+
+    @staticmethod
+    def clear() -> None:
+        """
+        Removes all loaded images and resets the counters
+        :return: None
+        """
+        AssetManager.__images = {}
+        AssetManager.hits = 0
+        AssetManager.misses = 0
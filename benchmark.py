@@ -0,0 +1,165 @@
+"""
+Runs the real game loop without a window for a number of frames and prints frame times as JSON
+
+    python benchmark.py --frames 600 --large 4 --seed 1 > result.json
+
+Input comes from a script of key presses, mouse clicks and mouse movement given by frame number,
+the default script walks the player around in a square
+The game writes the new maze to data/maze.txt and saves xp and items picked up to the player data,
+both files are put back afterwards so every run starts from the same state
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import json
+import argparse
+import numpy as np
+import pygame
+from time import perf_counter
+from game import Game
+from profiler import Profiler
+from constants import SIMULATION_RATE, PLAYER_DATA_PATH
+
+# Events are keyed by frame number, frames repeat every 'loop' frames
+DEFAULT_SCRIPT = {
+    "loop": 160,
+    "events": [
+        {"frame": 0, "mouse": [900, 500]},
+        {"frame": 0, "key": "d", "down": True},
+        {"frame": 40, "key": "d", "down": False},
+        {"frame": 40, "key": "s", "down": True},
+        {"frame": 80, "key": "s", "down": False},
+        {"frame": 80, "key": "a", "down": True},
+        {"frame": 120, "key": "a", "down": False},
+        {"frame": 120, "key": "w", "down": True},
+        {"frame": 159, "key": "w", "down": False}
+    ]
+}
+
+
+def script_events(script: dict, frame: int) -> list:
+    """
+    Gets the script entries for a frame
+    :param script: Dict of 'loop' and 'events'
+    :param frame: Frame number
+    :return: List of script entries
+    """
+    if script.get("loop"):
+        frame %= script["loop"]
+    return [e for e in script["events"] if e["frame"] == frame]
+
+
+def to_pygame_events(entries: list, mouse: list) -> list:
+    """
+    Turns script entries into pygame events, mouse movement and button states are stored in mouse
+    :param entries: Script entries for this frame
+    :param mouse: [position, pressed buttons], changed in place
+    :return: List of pygame.event.Event
+    """
+    events = []
+    for entry in entries:
+        if "key" in entry:
+            events.append(pygame.event.Event(
+                pygame.KEYDOWN if entry.get("down", True) else pygame.KEYUP, key=pygame.key.key_code(entry["key"])
+            ))
+        if "button" in entry:
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=entry["button"], pos=tuple(mouse[0])))
+        if "mouse" in entry:
+            mouse[0] = tuple(entry["mouse"])
+        if "pressed" in entry:
+            mouse[1] = tuple(bool(b) for b in entry["pressed"])
+    return events
+
+
+def run(frames: int, warmup: int, ms: float, script: dict, **game_args) -> dict:
+    """
+    Plays the game using the script and times every frame
+    :param frames: Number of frames to time
+    :param warmup: Number of frames to run first which aren't timed
+    :param ms: Time each frame is told has passed, 1000 / SIMULATION_RATE runs one simulation step per frame
+    :param script: Input script
+    :param game_args: Arguments for Game
+    :return: Results
+    """
+    # The game writes to these files so they are put back afterwards
+    saved = {}
+    for path in ["data/maze.txt", PLAYER_DATA_PATH]:
+        with open(path) as f:
+            saved[path] = f.read()
+
+    try:
+        game = Game(**game_args)
+        mouse = [(0, 0), (False, False, False)]
+        frame_times = []
+        running = True
+
+        for frame in range(warmup + frames):
+            if frame == warmup:
+                Profiler.reset(frames)
+            events = to_pygame_events(script_events(script, frame), mouse)
+            pygame.event.pump()
+
+            start = perf_counter()
+            running = game.frame(ms, events, (mouse[0], mouse[1]))
+            if frame >= warmup:
+                frame_times.append((perf_counter() - start) * 1000)
+            if not running:
+                break
+    finally:
+        for path, contents in saved.items():
+            with open(path, "w") as f:
+                f.write(contents)
+
+    times = np.array(frame_times)
+    p50, p95, p99 = np.percentile(times, (50, 95, 99)).tolist() if len(times) else (0.0, 0.0, 0.0)
+    counts, edges = np.histogram(times, bins=20) if len(times) else ([], [])
+    return {
+        "config": {"frames": frames, "warmup": warmup, "ms_per_frame": ms, **game_args},
+        "frames_timed": len(frame_times),
+        "finished_early": not running,
+        "frame_ms": {
+            "mean": float(times.mean()) if len(times) else 0.0,
+            "p50": p50, "p95": p95, "p99": p99,
+            "max": float(times.max()) if len(times) else 0.0
+        },
+        "histogram": {"counts": np.asarray(counts).tolist(), "edges_ms": np.asarray(edges).tolist()},
+        "phases_ms": Profiler.summary(),
+        "dropped_steps": game.timestep.dropped_steps,
+        "enemies_alive": len(game.enemies)
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Headless benchmark of the game loop")
+    parser.add_argument("--frames", type=int, default=600, help="Frames to time")
+    parser.add_argument("--warmup", type=int, default=30, help="Frames to run before timing starts")
+    parser.add_argument("--ms", type=float, default=1000 / SIMULATION_RATE, help="Milliseconds each frame is told has passed")
+    parser.add_argument("--player", default="alex", help="Player name in the player data file")
+    parser.add_argument("--maze-size", type=int, default=10, help="Maze grid size, the maze has maze_size // 2 cells along each side")
+    parser.add_argument("--small", type=int, default=0, help="Small enemies to start with")
+    parser.add_argument("--medium", type=int, default=0, help="Medium enemies to start with")
+    parser.add_argument("--large", type=int, default=2, help="Large enemies to start with")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the maze, doors, enemy placement, enemy AI and loot")
+    parser.add_argument("--script", help="JSON input script, see DEFAULT_SCRIPT for the format")
+    parser.add_argument("--output", help="File to write the results to instead of printing them")
+    args = parser.parse_args()
+
+    if args.script:
+        with open(args.script) as f:
+            input_script = json.load(f)
+    else:
+        input_script = DEFAULT_SCRIPT
+
+    results = run(
+        args.frames, args.warmup, args.ms, input_script,
+        player_name=args.player, maze_size=args.maze_size, seed=args.seed,
+        enemies={"small": args.small, "medium": args.medium, "large": args.large}
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
@@ -1,5 +1,8 @@
 import pygame
-from random import randint
+import math
+from rng import RNG
+from itertools import chain
+from collections import OrderedDict
 from constants import *
 pygame.init()
 
@@ -13,6 +16,10 @@ class Wall(pygame.Rect):
         self.x = x
         self.y = y
         self.open_ = bool(used)
+        self.orientation = orientation
+        # Doors cut into this wall and the parts of the wall which block movement, filled in by Board
+        self.doors = []
+        self.solids = [self]
 
 
 class Cell(pygame.Rect):
@@ -34,17 +41,19 @@ class Door(pygame.Rect):
         self.y = y + (offset if orientation == 1 else 0)
         self.open_ = bool(used)
         self.offset = offset
+        # Wall the door is cut into, filled in by Board
+        self.wall = None
 
 
 class Board(pygame.Surface):
-    def __init__(self, width, height):
-        super().__init__((width, height), pygame.SRCALPHA)
+    def __init__(self, width, height, chunk_budget=BOARD_CHUNK_BUDGET):
+        # The surface only covers the window, the rest of the board is kept in chunks
+        super().__init__((WINDOW_WIDTH, WINDOW_HEIGHT))
         self.__width = width
         self.__height = height
         self.__grid = self.load_maze("data/maze.txt")
-        self.x = 0
-        self.y = 0
         cell_num = self.__grid[1].count("X")
+        self.__cell_num = cell_num
         # All cell positions
         # self.cell_pos = [[Cell(380 * j + (20 * (j + 1)), 380 * i + (20 * (i + 1)), 1) for j in range(cell_num)]
         #                  for i in range(cell_num)]
@@ -61,13 +70,37 @@ class Board(pygame.Surface):
         self.hori_wall_pos = [[Wall(WALL_HORIZONTAL_WIDTH * j + WALL_VERTICAL_WIDTH, WALL_VERTICAL_HEIGHT * i, 1, 2) for j in range(cell_num)] for i in range(cell_num + 1)]
         # All vertical walls
         self.vert_wall_pos = [[Wall(WALL_HORIZONTAL_WIDTH * j, WALL_VERTICAL_HEIGHT * i + WALL_HORIZONTAL_HEIGHT, 1, 1) for j in range(cell_num + 1)] for i in range(cell_num)]
-        # All horizontal doors
-        self.hori_door_pos = [[Door(WALL_HORIZONTAL_WIDTH * (j // 2), WALL_VERTICAL_HEIGHT * (i // 2), 0 if self.__grid[i][j + 1] == "-" else 1, 2, randint(50, 200))
+        # All horizontal doors, door offsets along the wall are random
+        door_rng = RNG.stream("doors")
+        self.hori_door_pos = [[Door(WALL_HORIZONTAL_WIDTH * (j // 2), WALL_VERTICAL_HEIGHT * (i // 2), 0 if self.__grid[i][j + 1] == "-" else 1, 2, door_rng.randint(50, 200))
                               for j in range(0, len(self.__grid) - 1, 2)] for i in range(0, len(self.__grid), 2)]
         # All vertical doors
-        self.vert_door_pos = [[Door(WALL_HORIZONTAL_WIDTH * (j // 2), WALL_VERTICAL_HEIGHT * (i // 2), 0 if self.__grid[i][j - 1] == "|" else 1, 1, randint(50, 200))
+        self.vert_door_pos = [[Door(WALL_HORIZONTAL_WIDTH * (j // 2), WALL_VERTICAL_HEIGHT * (i // 2), 0 if self.__grid[i][j - 1] == "|" else 1, 1, door_rng.randint(50, 200))
                               for j in range(1, len(self.__grid) + 1, 2)] for i in range(1, len(self.__grid), 2)]
 
+        # Walls and doors touching each square of the maze lattice, so a collision query only has to check the
+        # few rects in the squares it overlaps instead of every wall and door on the board
+        self.__wall_index = self.__build_index(chain(chain.from_iterable(self.vert_wall_pos), chain.from_iterable(self.hori_wall_pos)))
+        self.__vert_door_index = self.__build_index(chain.from_iterable(self.vert_door_pos))
+        self.__hori_door_index = self.__build_index(chain.from_iterable(self.hori_door_pos))
+        for door in chain(chain.from_iterable(self.vert_door_pos), chain.from_iterable(self.hori_door_pos)):
+            for wall in self.__nearby(self.__wall_index, self.__index_keys(door)):
+                if wall.contains(door):
+                    wall.doors.append(door)
+                    door.wall = wall
+                    break
+        for wall in chain(chain.from_iterable(self.vert_wall_pos), chain.from_iterable(self.hori_wall_pos)):
+            self.__cut_doors(wall)
+
+        # Walls, doors and cells only change when a maze is loaded so they are drawn to chunks the first
+        # time they come into view, update() then copies back only the regions invalidated since the last frame
+        self.__chunks = OrderedDict()
+        self.__chunk_budget = chunk_budget
+        self.__chunk_memory = 0
+        self.__dirty = []
+        self.__drawn_view = None
+        self.__changed = []
+
     @property
     def width(self):
         return self.__width
@@ -76,6 +109,18 @@ class Board(pygame.Surface):
     def height(self):
         return self.__height
 
+    @property
+    def chunk_memory(self) -> int:
+        return self.__chunk_memory
+
+    @property
+    def changed_rects(self) -> list:
+        """
+        Areas of the board surface which were restored in the last update, e.g after a door changed
+        :return: List of rects in window coordinates
+        """
+        return self.__changed
+
     @staticmethod
     def load_maze(fn: str) -> list:
         """
@@ -86,61 +131,407 @@ class Board(pygame.Surface):
         with open(fn) as f:
             return [i.replace("\n", "") for i in f.readlines()]
 
+    @staticmethod
+    def __index_keys(rect: pygame.Rect) -> list:
+        """
+        Gets the squares of the maze lattice which a rect overlaps
+        :param rect: Rect in board coordinates
+        :return: List of (column, row)
+        """
+        return [
+            (i, j)
+            for j in range(rect.top // WALL_VERTICAL_HEIGHT, (rect.bottom - 1) // WALL_VERTICAL_HEIGHT + 1)
+            for i in range(rect.left // WALL_HORIZONTAL_WIDTH, (rect.right - 1) // WALL_HORIZONTAL_WIDTH + 1)
+        ]
+
+    @staticmethod
+    def __build_index(rects) -> dict:
+        """
+        Puts each rect in every square of the maze lattice it overlaps
+        :param rects: Iterable of walls or doors
+        :return: Dict of (column, row) to list of rects
+        """
+        index = {}
+        for rect in rects:
+            for key in Board.__index_keys(rect):
+                index.setdefault(key, []).append(rect)
+        return index
+
+    @staticmethod
+    def __nearby(index: dict, keys: list):
+        """
+        Gets the rects from an index in the given squares, a rect in more than one square is given more than once
+        :param index: Index from __build_index
+        :param keys: Squares from __index_keys
+        :return: Iterator of rects
+        """
+        return chain.from_iterable(index.get(key, ()) for key in keys)
+
     def door_collide(self, player):
-        player_rect = pygame.Rect((player.x + (player.width // 2)) - self.x, (player.y + (player.height // 2)) - self.y, player.width, player.height)
-        for row in self.vert_door_pos:
-            for door in row:
-                if door.y < player_rect.y < door.y + door.height and door.y < player_rect.y + player_rect.height < door.y + door.height:
-                    if player_rect.colliderect(door):
-                        return "door closed" if not door.open_ else "door open"
-
-        for row in self.hori_door_pos:
-            for door in row:
-                if door.x < player_rect.x < door.x + door.width and door.x < player_rect.x + player_rect.width < door.x + door.width:
-                    if player_rect.colliderect(door):
-                        return "door closed"if not door.open_ else "door open"
+        player_rect = pygame.Rect(player.x + (player.width // 2), player.y + (player.height // 2), player.width, player.height)
+        keys = self.__index_keys(player_rect)
+        for door in self.__nearby(self.__vert_door_index, keys):
+            if door.y < player_rect.y < door.y + door.height and door.y < player_rect.y + player_rect.height < door.y + door.height:
+                if player_rect.colliderect(door):
+                    return "door closed" if not door.open_ else "door open"
+
+        for door in self.__nearby(self.__hori_door_index, keys):
+            if door.x < player_rect.x < door.x + door.width and door.x < player_rect.x + player_rect.width < door.x + door.width:
+                if player_rect.colliderect(door):
+                    return "door closed"if not door.open_ else "door open"
 
         return "not on door"
 
     def wall_collide(self, player):
-        player_rect = pygame.Rect((player.x + (player.width // 2)) - self.x, (player.y + (player.height // 2)) - self.y, player.width, player.height)
-        for row in self.vert_wall_pos:
-            for wall in row:
-                if player_rect.colliderect(wall):
-                    return True
-
-        for row in self.hori_wall_pos:
-            for wall in row:
-                if player_rect.colliderect(wall):
-                    return True
+        player_rect = pygame.Rect(player.x + (player.width // 2), player.y + (player.height // 2), player.width, player.height)
+        for wall in self.__nearby(self.__wall_index, self.__index_keys(player_rect)):
+            if player_rect.colliderect(wall):
+                return True
 
         return False
 
-    def cell_collide(self, entity):
-        entity_rect = pygame.Rect((entity.x + (entity.width // 2)) - self.x, (entity.y + (entity.height // 2)) - self.y, entity.width, entity.height)
-        for r_pos, row in enumerate(self.cell_pos):
-            for c_pos, cell in enumerate(row):
-                if entity_rect.colliderect(cell):
-                    return r_pos, c_pos
+    @staticmethod
+    def __cut_doors(wall: Wall) -> None:
+        """
+        Works out the parts of a wall which block movement, open doors leave gaps in it
+        :param wall: Wall to update the solids of
+        :return: None
+        """
+        open_doors = [door for door in wall.doors if door.open_]
+        if not open_doors:
+            wall.solids = [wall]
+            return
+
+        # Cut the gaps out along the length of the wall, 1 = vertical, 2 = horizontal
+        if wall.orientation == 1:
+            gaps, start, end = sorted((door.top, door.bottom) for door in open_doors), wall.top, wall.bottom
+            piece = lambda a, b: pygame.Rect(wall.x, a, wall.width, b - a)
+        else:
+            gaps, start, end = sorted((door.left, door.right) for door in open_doors), wall.left, wall.right
+            piece = lambda a, b: pygame.Rect(a, wall.y, b - a, wall.height)
+        wall.solids = []
+        for gap_start, gap_end in gaps:
+            if gap_start > start:
+                wall.solids.append(piece(start, gap_start))
+            start = max(start, gap_end)
+        if end > start:
+            wall.solids.append(piece(start, end))
+
+    def __solid_rects(self, keys: list):
+        """
+        Gets the parts of the walls in the given squares which block movement
+        :param keys: Squares from __index_keys
+        :return: Iterator of rects
+        """
+        return chain.from_iterable(wall.solids for wall in self.__nearby(self.__wall_index, keys))
+
+    @staticmethod
+    def __swept_rect(box: tuple, dx: float, dy: float) -> pygame.Rect:
+        """
+        Gets a rect covering everything a box touches during a move, rounded out to whole pixels so boxes at
+        fractional positions are never cut short
+        :param box: (x, y, width, height) of the box at the start of the move
+        :param dx: Amount the box moves right
+        :param dy: Amount the box moves down
+        :return: Rect in board coordinates, one pixel bigger than the area so walls touching it are included
+        """
+        left, top = math.floor(min(box[0], box[0] + dx)), math.floor(min(box[1], box[1] + dy))
+        right, bottom = math.ceil(max(box[0], box[0] + dx) + box[2]), math.ceil(max(box[1], box[1] + dy) + box[3])
+        return pygame.Rect(left, top, right - left + 1, bottom - top + 1)
+
+    @staticmethod
+    def __overlaps(box: tuple, solid: pygame.Rect) -> bool:
+        """
+        Checks if a box at a fractional position overlaps a rect, boxes which only touch edges don't overlap
+        :param box: (x, y, width, height)
+        :param solid: Rect to check against
+        :return: bool
+        """
+        return box[0] < solid.right and box[0] + box[2] > solid.x and box[1] < solid.bottom and box[1] + box[3] > solid.y
+
+    @staticmethod
+    def __time_of_impact(box: tuple, dx: float, dy: float, solid: pygame.Rect):
+        """
+        Finds when a moving box first overlaps a solid rect, boxes which only touch edges don't overlap
+        :param box: (x, y, width, height) of the box at the start of the move
+        :param dx: Amount the box moves right
+        :param dy: Amount the box moves down
+        :param solid: Rect the box can't move into
+        :return: (time, axis) where time is the fraction of the move made before the hit and axis is 0 if the box
+                 hit a side facing along x or 1 for y, None if they don't hit or the box starts inside the solid
+        """
+        entry, exit_ = [], []
+        for pos, size, d, solid_pos, solid_size in ((box[0], box[2], dx, solid.x, solid.w), (box[1], box[3], dy, solid.y, solid.h)):
+            if d == 0:
+                if pos + size <= solid_pos or pos >= solid_pos + solid_size:
+                    return None
+                entry.append(-math.inf)
+                exit_.append(math.inf)
+            elif d > 0:
+                entry.append((solid_pos - pos - size) / d)
+                exit_.append((solid_pos + solid_size - pos) / d)
+            else:
+                entry.append((solid_pos + solid_size - pos) / d)
+                exit_.append((solid_pos - pos - size) / d)
+
+        time = max(entry)
+        if time < 0 or time >= 1 or time >= min(exit_):
+            return None
+        return time, 0 if entry[0] >= entry[1] else 1
+
+    def move(self, entity, dx: float, dy: float) -> tuple:
+        """
+        Sweeps an entity's collision rect along the whole move, the entity stops where it first touches a wall or
+        closed door and slides along it for the rest of the move, so it can't pass through walls however far it moves
+        Walls the entity is already inside don't block it so it can always get out
+        :param entity: Anything with x, y, width and height in board coordinates
+        :param dx: Amount to move right
+        :param dy: Amount to move down
+        :return: (x, y) position after the move
+        """
+        x, y = entity.x, entity.y
+        w, h = entity.width, entity.height
+        box_x, box_y = x + (w // 2), y + (h // 2)
+
+        # Everything the rect could touch on the way
+        start = (box_x, box_y, w, h)
+        solids = list(self.__solid_rects(self.__index_keys(self.__swept_rect(start, dx, dy))))
+
+        # Each hit stops movement along one axis, so there are at most two
+        for _ in range(2):
+            if not dx and not dy:
+                break
+            hits = [(hit, solid) for hit, solid in ((self.__time_of_impact((box_x, box_y, w, h), dx, dy, solid), solid) for solid in solids) if hit is not None]
+            if not hits:
+                box_x, box_y = box_x + dx, box_y + dy
+                break
 
-    def update(self) -> None:
+            (time, axis), solid = min(hits, key=lambda hit: hit[0][0])
+            # Put the rect exactly against the side it hit and slide along it for the rest of the move
+            if axis == 0:
+                box_x = solid.x - w if dx > 0 else solid.x + solid.w
+                box_y += dy * time
+                dx, dy = 0, dy * (1 - time)
+            else:
+                box_y = solid.y - h if dy > 0 else solid.y + solid.h
+                box_x += dx * time
+                dx, dy = dx * (1 - time), 0
+
+        # Rounding when sliding can leave the rect just inside a wall it didn't start in, it stays put instead
+        end = (box_x, box_y, w, h)
+        if any(self.__overlaps(end, solid) and not self.__overlaps(start, solid) for solid in solids):
+            return x, y
+        return box_x - (w // 2), box_y - (h // 2)
+
+    def raycast(self, rect: pygame.Rect, dx: float, dy: float):
+        """
+        Finds when a small moving rect such as a bullet first hits a wall or closed door, the lattice squares the
+        rect's top left corner passes through are walked in order so only the walls around them are checked
+        and the rect can't pass through a wall however fast it moves
+        :param rect: Rect in board coordinates at the start of the move
+        :param dx: Amount the rect moves right
+        :param dy: Amount the rect moves down
+        :return: Fraction of the move made before the hit, 0 if it starts on a wall, None if it doesn't hit anything
+        """
+        box = (rect.x, rect.y, rect.w, rect.h)
+        for solid in self.__solid_rects(self.__index_keys(rect)):
+            if rect.colliderect(solid):
+                return 0
+
+        # A wall stops the corner in any square it covers once it is grown left and up by the rect's size,
+        # so each square is checked along with the strip of the squares right of and below it that the rect reaches
+        col, row = int(rect.x // WALL_HORIZONTAL_WIDTH), int(rect.y // WALL_VERTICAL_HEIGHT)
+        end_col, end_row = int((rect.x + dx) // WALL_HORIZONTAL_WIDTH), int((rect.y + dy) // WALL_VERTICAL_HEIGHT)
+        step_col, step_row = (1 if dx > 0 else -1), (1 if dy > 0 else -1)
+        # Fraction of the move at which the corner crosses the next column and row lines, and between lines
+        next_col = ((col + (dx > 0)) * WALL_HORIZONTAL_WIDTH - rect.x) / dx if dx else math.inf
+        next_row = ((row + (dy > 0)) * WALL_VERTICAL_HEIGHT - rect.y) / dy if dy else math.inf
+        col_time = WALL_HORIZONTAL_WIDTH / abs(dx) if dx else math.inf
+        row_time = WALL_VERTICAL_HEIGHT / abs(dy) if dy else math.inf
+
+        # Walls which don't touch the area covered by the whole move can't be hit
+        swept = self.__swept_rect(box, dx, dy)
+        first_hit = None
+        while True:
+            square = pygame.Rect(col * WALL_HORIZONTAL_WIDTH, row * WALL_VERTICAL_HEIGHT, WALL_HORIZONTAL_WIDTH + rect.w, WALL_VERTICAL_HEIGHT + rect.h)
+            for solid in self.__solid_rects(self.__index_keys(square)):
+                if not swept.colliderect(solid):
+                    continue
+                hit = self.__time_of_impact(box, dx, dy, solid)
+                if hit is not None and (first_hit is None or hit[0] < first_hit):
+                    first_hit = hit[0]
+
+            # A hit after the corner leaves this square could be behind a wall in a square not checked yet
+            leave = min(next_col, next_row)
+            if first_hit is not None and first_hit <= leave:
+                return first_hit
+            if (col, row) == (end_col, end_row) or leave >= 1:
+                return first_hit
+            if next_col < next_row:
+                col += step_col
+                next_col += col_time
+            else:
+                row += step_row
+                next_row += row_time
+
+    def cell_collide(self, entity) -> tuple:
+        """
+        Gets the cell an entity is in from the centre of its collision rect, each cell owns the wall to its left
+        and the wall above it so an entity on a wall is in the cell to the right of or below that wall,
+        positions past the edges of the board are in the nearest edge cell
+        :param entity: Anything with x, y, width and height in board coordinates
+        :return: (row, column) into cell_pos
+        """
+        centre_x = entity.x + (entity.width // 2) * 2
+        centre_y = entity.y + (entity.height // 2) * 2
+        row = min(max(int(centre_y // (CELL_HEIGHT + WALL_HORIZONTAL_HEIGHT)), 0), self.__cell_num - 1)
+        column = min(max(int(centre_x // (CELL_WIDTH + WALL_VERTICAL_WIDTH)), 0), self.__cell_num - 1)
+        return row, column
+
+    @staticmethod
+    def __draw_door(surface: pygame.Surface, rect: pygame.Rect, open_: bool) -> None:
+        """
+        Draws a door over the wall it sits in, open doors are drawn as a gap in the wall
+        :param surface: Surface to draw the door to
+        :param rect: Position of the door on the surface
+        :param open_: Whether the door is open
+        :return: None
+        """
+        pygame.draw.rect(surface, BOARD_BACKGROUND if open_ else WALL_COLOUR, rect)
+
+    @staticmethod
+    def __lattice_slice(grid: list, rect: pygame.Rect):
+        """
+        Gets the walls, doors or cells in the rows and columns of the maze lattice which the rect touches
+        Horizontal walls reach into the next column so one extra row and column is included before the rect
+        :param grid: 2D list of walls, doors or cells indexed by lattice row and column
+        :param rect: Rect in board coordinates
+        :return: Iterator of the rects in range
+        """
+        r0, r1 = max(rect.top // WALL_VERTICAL_HEIGHT - 1, 0), rect.bottom // WALL_VERTICAL_HEIGHT + 1
+        c0, c1 = max(rect.left // WALL_HORIZONTAL_WIDTH - 1, 0), rect.right // WALL_HORIZONTAL_WIDTH + 1
+        return chain.from_iterable(row[c0:c1] for row in grid[r0:r1])
+
+    def __render_chunk(self, chunk_rect: pygame.Rect) -> pygame.Surface:
+        """
+        Draws the walls, doors and cells inside a chunk
+        :param chunk_rect: Area of the board the chunk covers
+        :return: The chunk surface
+        """
+        chunk = pygame.Surface(chunk_rect.size)
+        chunk.fill(BOARD_BACKGROUND)
+        offset = (-chunk_rect.x, -chunk_rect.y)
+        for wall in chain(self.__lattice_slice(self.hori_wall_pos, chunk_rect), self.__lattice_slice(self.vert_wall_pos, chunk_rect)):
+            pygame.draw.rect(chunk, WALL_COLOUR, wall.move(offset))
+        for door in chain(self.__lattice_slice(self.hori_door_pos, chunk_rect), self.__lattice_slice(self.vert_door_pos, chunk_rect)):
+            self.__draw_door(chunk, door.move(offset), door.open_)
+        for cell in self.__lattice_slice(self.cell_pos, chunk_rect):
+            pygame.draw.rect(chunk, BOARD_BACKGROUND, cell.move(offset))
+        return chunk
+
+    def __get_chunk(self, key: tuple) -> pygame.Surface:
+        """
+        Gets a chunk from the cache, rendering it if needed and evicting the least recently used chunks
+        once the cache is over its memory budget
+        :param key: (column, row) of the chunk
+        :return: The chunk surface
         """
-        Update the board
+        if key in self.__chunks:
+            self.__chunks.move_to_end(key)
+            return self.__chunks[key]
+
+        chunk = self.__render_chunk(self.__chunk_rect(key))
+        self.__chunks[key] = chunk
+        self.__chunk_memory += chunk.get_width() * chunk.get_height() * chunk.get_bytesize()
+        while self.__chunk_memory > self.__chunk_budget and len(self.__chunks) > 1:
+            self.__drop_chunk(next(iter(self.__chunks)))
+        return chunk
+
+    def __drop_chunk(self, key: tuple) -> None:
+        """
+        Removes a chunk from the cache so it is rendered again when it is next needed
+        :param key: (column, row) of the chunk
+        :return: None
+        """
+        chunk = self.__chunks.pop(key, None)
+        if chunk is not None:
+            self.__chunk_memory -= chunk.get_width() * chunk.get_height() * chunk.get_bytesize()
+
+    def __chunk_rect(self, key: tuple) -> pygame.Rect:
+        """
+        Gets the area of the board covered by a chunk, chunks on the edges are cut to the board size
+        :param key: (column, row) of the chunk
+        :return: Rect in board coordinates
+        """
+        return pygame.Rect(key[0] * BOARD_CHUNK_SIZE, key[1] * BOARD_CHUNK_SIZE, BOARD_CHUNK_SIZE, BOARD_CHUNK_SIZE).clip(0, 0, self.__width, self.__height)
+
+    def __chunk_keys(self, rect: pygame.Rect) -> list:
+        """
+        Gets the keys of all chunks which overlap the rect
+        :param rect: Rect in board coordinates
+        :return: List of (column, row)
+        """
+        return [
+            (i, j)
+            for j in range(rect.top // BOARD_CHUNK_SIZE, (rect.bottom - 1) // BOARD_CHUNK_SIZE + 1)
+            for i in range(rect.left // BOARD_CHUNK_SIZE, (rect.right - 1) // BOARD_CHUNK_SIZE + 1)
+        ]
+
+    def __restore(self, rect: pygame.Rect, view: pygame.Rect) -> None:
+        """
+        Copies an area of the board from its chunks to the surface
+        :param rect: Area in board coordinates, must be inside the board
+        :param view: The current viewport
+        :return: None
+        """
+        for key in self.__chunk_keys(rect):
+            chunk_rect = self.__chunk_rect(key)
+            area = rect.clip(chunk_rect)
+            self.blit(self.__get_chunk(key), (area.x - view.x, area.y - view.y), area.move(-chunk_rect.x, -chunk_rect.y))
+
+    def invalidate(self, rect: pygame.Rect) -> None:
+        """
+        Marks an area of the board to be drawn again from its chunks on the next update
+        :param rect: Area in board coordinates
+        :return: None
+        """
+        rect = pygame.Rect(rect).clip(0, 0, self.__width, self.__height)
+        if rect.w and rect.h:
+            self.__dirty.append(rect)
+
+    def set_door_state(self, door: Door, open_: bool) -> None:
+        """
+        Opens or closes a door, the chunks it is drawn in are rendered again when they are next needed
+        :param door: Door to change
+        :param open_: True to open the door, False to close it
         :return: None
         """
-        self.fill((0, 0, 0))
-        for hor in self.hori_wall_pos:
-            for h in hor:
-                pygame.draw.rect(self, (160, 82, 45), h)
-        for vert in self.vert_wall_pos:
-            for v in vert:
-                pygame.draw.rect(self, (160, 82, 45), v)
-        for door in self.hori_door_pos:
-            for d in door:
-                pygame.draw.rect(self, (0, 0, 0) if d.open_ else (160, 82, 45), d)
-        for door in self.vert_door_pos:
-            for d in door:
-                pygame.draw.rect(self, (0, 0, 0) if d.open_ else (160, 82, 45), d)
-        for row in self.cell_pos:
-            for cell in row:
-                pygame.draw.rect(self, (0, 0, 0), cell)
+        if door.open_ != bool(open_):
+            door.open_ = bool(open_)
+            if door.wall is not None:
+                self.__cut_doors(door.wall)
+            for key in self.__chunk_keys(door):
+                self.__drop_chunk(key)
+            self.invalidate(door)
+
+    def update(self, view: pygame.Rect) -> bool:
+        """
+        Update the board surface, the whole window is drawn from the chunks when the camera has moved,
+        otherwise only the invalidated areas are restored
+        :param view: Area of the board visible in the window, from Camera.rect
+        :return: True if the whole window was redrawn, False if only the changed_rects were
+        """
+        self.__changed = []
+        redrawn = view != self.__drawn_view
+        if redrawn:
+            self.fill(BOARD_BACKGROUND)
+            self.__restore(view.clip(0, 0, self.__width, self.__height), view)
+            self.__drawn_view = view
+        else:
+            for rect in self.__dirty:
+                rect = rect.clip(view)
+                if rect.w and rect.h:
+                    self.__restore(rect, view)
+                    self.__changed.append(rect.move(-view.x, -view.y))
+        self.__dirty = []
+        return redrawn
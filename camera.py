@@ -0,0 +1,76 @@
+import pygame
+from constants import WINDOW_WIDTH, WINDOW_HEIGHT
+
+
+class Camera:
+    """The part of the world shown in the window, everything else stays in world coordinates and is only moved here"""
+    def __init__(self, world_width: int, world_height: int, width: int=WINDOW_WIDTH, height: int=WINDOW_HEIGHT):
+        self.__world_width = world_width
+        self.__world_height = world_height
+        self.__width = width
+        self.__height = height
+        self.x = 0
+        self.y = 0
+
+    @property
+    def width(self):
+        return self.__width
+
+    @property
+    def height(self):
+        return self.__height
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """
+        Area of the world visible in the window
+        :return: Rect in world coordinates
+        """
+        return pygame.Rect(self.x, self.y, self.__width, self.__height)
+
+    def to_screen(self, x: float, y: float) -> tuple:
+        """
+        Converts a world position to a window position
+        :param x: World x coord
+        :param y: World y coord
+        :return: (x, y) in the window
+        """
+        return x - self.x, y - self.y
+
+    def to_world(self, x: float, y: float) -> tuple:
+        """
+        Converts a window position, e.g the mouse, to a world position
+        :param x: Window x coord
+        :param y: Window y coord
+        :return: (x, y) in the world
+        """
+        return x + self.x, y + self.y
+
+    def apply(self, rect: pygame.Rect) -> pygame.Rect:
+        """
+        Moves a rect from world to window coordinates
+        :param rect: Rect in world coordinates
+        :return: New rect in window coordinates
+        """
+        return pygame.Rect(rect).move(-self.x, -self.y)
+
+    def in_view(self, rect: pygame.Rect) -> bool:
+        """
+        Checks if any part of the rect is visible in the window
+        :param rect: Rect in world coordinates
+        :return: True if visible, False if not
+        """
+        return self.rect.colliderect(rect)
+
+    def scroll(self, dx: float, dy: float) -> bool:
+        """
+        Moves the camera as long as the window stays inside the world
+        :param dx: Amount to move right
+        :param dy: Amount to move down
+        :return: True if the camera moved, False if it would have left the world
+        """
+        if not pygame.Rect(0, 0, self.__world_width, self.__world_height).contains((self.x + dx, self.y + dy, self.__width, self.__height)):
+            return False
+        self.x += dx
+        self.y += dy
+        return True
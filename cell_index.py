@@ -0,0 +1,106 @@
+import pygame
+from constants import CELL_WIDTH, CELL_HEIGHT, WALL_VERTICAL_WIDTH, WALL_HORIZONTAL_HEIGHT
+
+
+class CellIndex:
+    """
+    Buckets moving objects such as enemies and item drops by the maze cells their rects overlap, so finding the
+    objects near something only looks at the cells around it instead of every object on the board
+    An object is only moved between buckets when its rect crosses into a different cell
+    """
+    def __init__(self, cell_width: int=CELL_WIDTH + WALL_VERTICAL_WIDTH, cell_height: int=CELL_HEIGHT + WALL_HORIZONTAL_HEIGHT):
+        self.__cell_width = cell_width
+        self.__cell_height = cell_height
+        # Buckets are dicts used as ordered sets so queries give objects in the order they were added
+        self.__buckets = {}
+        self.__cells = {}
+
+    def __len__(self):
+        return len(self.__cells)
+
+    def __contains__(self, obj):
+        return obj in self.__cells
+
+    def __cell_range(self, rect: pygame.Rect) -> tuple:
+        """
+        Gets the cells a rect overlaps
+        :param rect: Rect in board coordinates
+        :return: (first column, first row, last column, last row)
+        """
+        return (
+            int(rect.left // self.__cell_width), int(rect.top // self.__cell_height),
+            int((rect.right - 1) // self.__cell_width), int((rect.bottom - 1) // self.__cell_height)
+        )
+
+    @staticmethod
+    def __keys(cell_range: tuple):
+        c0, r0, c1, r1 = cell_range
+        return ((c, r) for r in range(r0, r1 + 1) for c in range(c0, c1 + 1))
+
+    def insert(self, obj, rect: pygame.Rect) -> None:
+        """
+        Adds an object, or moves it if it has already been added
+        :param obj: Object to add, must be hashable
+        :param rect: Area the object covers in board coordinates
+        :return: None
+        """
+        if obj in self.__cells:
+            self.move(obj, rect)
+            return
+        cell_range = self.__cell_range(rect)
+        self.__cells[obj] = cell_range
+        for key in self.__keys(cell_range):
+            self.__buckets.setdefault(key, {})[obj] = None
+
+    def remove(self, obj) -> None:
+        """
+        Removes an object, nothing happens if it isn't in the index
+        :param obj: Object to remove
+        :return: None
+        """
+        cell_range = self.__cells.pop(obj, None)
+        if cell_range is None:
+            return
+        for key in self.__keys(cell_range):
+            bucket = self.__buckets[key]
+            del bucket[obj]
+            if not bucket:
+                del self.__buckets[key]
+
+    def move(self, obj, rect: pygame.Rect) -> None:
+        """
+        Updates where an object is, its buckets only change if it has moved into a different cell
+        :param obj: Object which has moved
+        :param rect: Area the object now covers in board coordinates
+        :return: None
+        """
+        if self.__cells.get(obj) != self.__cell_range(rect):
+            self.remove(obj)
+            self.insert(obj, rect)
+
+    def query(self, rect: pygame.Rect) -> list:
+        """
+        Gets the objects in the cells a rect overlaps, these may not overlap the rect itself
+        :param rect: Area in board coordinates
+        :return: List of objects, each only once
+        """
+        cell_range = self.__cell_range(rect)
+        if cell_range[:2] == cell_range[2:]:
+            return list(self.__buckets.get(cell_range[:2], ()))
+        found = {}
+        for key in self.__keys(cell_range):
+            found.update(self.__buckets.get(key, {}))
+        return list(found)
+
+    def query_cell(self, column: int, row: int, radius: int=0) -> list:
+        """
+        Gets the objects in a cell and the cells around it
+        :param column: Column of the cell
+        :param row: Row of the cell
+        :param radius: Number of cells around the cell to include
+        :return: List of objects, each only once
+        """
+        found = {}
+        for key in self.__keys((column - radius, row - radius, column + radius, row + radius)):
+            found.update(self.__buckets.get(key, {}))
+        return list(found)
@@ -43,10 +43,18 @@ ITEM_DROP_DISPLAY_BACKGROUND = (0, 0, 0, 0)
 
 BEZIER_POINT_COLOUR = (0, 0, 255)
 
+BOARD_BACKGROUND = (0, 0, 0)
+WALL_COLOUR = (160, 82, 45)
+
 MENU_BACKGROUND_COLOUR = (60, 60, 60, 60)
 MENU_BUTTON_COLOUR = (255, 128, 0)
 MENU_SELECTED = (255, 255, 255)
 
+PROFILER_BACKGROUND = (20, 20, 20, 200)
+PROFILER_TEXT_COLOUR = (0, 255, 0)
+PROFILER_BAR_COLOUR = (0, 160, 255)
+PROFILER_BUDGET_COLOUR = (255, 0, 0)
+
 
 # DIMENSIONS
 WINDOW_WIDTH = 1280
@@ -78,16 +86,50 @@ ITEM_DROP_HEIGHT = 50
 MAX_MELEE_SWING_WIDTH = 200
 MAX_MELEE_SWING_HEIGHT = 200
 
+BOARD_CHUNK_SIZE = 512
+
 MENU_WIDTH = 300
 MENU_HEIGHT = 500
 MENU_MARGIN_X = 20
 MENU_MARGIN_Y = 20
 
+PROFILER_WIDTH = 420
+PROFILER_HEIGHT = 300
+
 # Misc Values
 MAX_BULLET_SPEED = 19
 PLAYER_DAMAGE_COOLDOWN = 5
 ENEMY_DAMAGE_COOLDOWN = 5
 PLAYER_MV_AMOUNT = 10
+BOARD_CHUNK_BUDGET = 32 * 1024 * 1024  # Bytes of board chunks kept in memory
+TEXT_CACHE_SIZE = 256  # Rendered strings kept by TextCache
+ROTATION_STEPS = 64  # Angles each entity image is pre-rotated to
+PROJECTILE_CAPACITY = 256  # Starting size of the projectile arrays, doubled when full
+ITEM_DROP_FRAME_TIME = 33  # Milliseconds each pickup animation frame is shown for
+SIMULATION_RATE = 30  # Simulation steps per second, independent of the frame rate
+MAX_SIMULATION_STEPS = 5  # Steps run in one frame before the rest are dropped
+MAX_FRAME_RATE = 144
+PROFILER_HISTORY = 240  # Frames the profiler keeps timings for
+PROFILER_REFRESH = 15  # Frames between profiler overlay redraws
+
+# Render layers, lower layers are drawn first
+LAYER_BOARD = 0
+LAYER_ITEM_DROPS = 1
+LAYER_PATHS = 2
+LAYER_BULLETS = 3
+LAYER_ENEMIES = 4
+LAYER_PLAYER = 5
+LAYER_EFFECTS = 6
+LAYER_HUD = 7
+LAYER_PANELS = 8
+LAYER_MENU = 9
+LAYER_OVERLAY = 10
+
+# Game loop phases timed by the profiler, in the order they run
+PROFILER_PHASES = ["events", "collision", "gameplay", "pathfinding", "enemies", "bullets", "board", "sprites", "hud", "draw", "flip"]
+
+# Independent random number streams, each subsystem draws from its own so changing one doesn't shift the others
+RNG_STREAMS = ["maze", "doors", "spawn", "ai", "loot"]
 
 # File paths
 RARITIES_PATH = "data/colours.json"
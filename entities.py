@@ -4,10 +4,11 @@ from constants import *
 from data_loader import DataLoader
 from a_star import AStar
 from board import Board
-from secrets import randbelow
 from items import Item
 from utils import colour_lerp
-from random import randint
+from renderer import RotationCache
+from profiler import Profiler
+from rng import RNG
 from dataclasses import dataclass
 
 
@@ -16,7 +17,8 @@ class Player(pygame.Surface):
         self.__width = ENTITY_INFO["player"][0]
         self.__height = ENTITY_INFO["player"][1]
         super().__init__((self.__width * 2, self.__height * 2), pygame.SRCALPHA)
-        self.__img = pygame.image.load(f"assets/{WINDOW_WIDTH}x{WINDOW_HEIGHT}/player.png")
+        self.__rotations = RotationCache.load("player")
+        self.__drawn_frame = None
         self.x, self.y = 200, 200
         self.__max_health, self.__health = None, None
         self.__max_mana, self.__mana = None, None
@@ -68,10 +70,13 @@ class Player(pygame.Surface):
             DataLoader.change_file("add_level")
 
     def update(self, mx, my):
-        self.fill((0, 0, 0, 0))
+        # Only redraw if the player is facing a different pre-rotated frame
         degrees = math.degrees(math.atan2((self.x + self.__width) - mx, (self.y + self.__height) - my))
-        rotated_img = pygame.transform.rotate(self.__img, degrees)
-        self.blit(rotated_img, (self.__width // 2, self.__height // 2))
+        rotated_img = self.__rotations.get(degrees)
+        if rotated_img is not self.__drawn_frame:
+            self.fill((0, 0, 0, 0))
+            self.blit(rotated_img, (self.__width // 2, self.__height // 2))
+            self.__drawn_frame = rotated_img
 
         # Damage cooldown
         if self.__damage_cooldown > 0:
@@ -90,7 +95,8 @@ class Enemy(pygame.Surface):
         self.x, self.y = x, y
         self.__max_health = ENTITY_INFO[size][2]
         self.__health = self.__max_health
-        self.__img = pygame.image.load(f"assets/{WINDOW_WIDTH}x{WINDOW_HEIGHT}/{size}.png")
+        self.__rotations = RotationCache.load(size)
+        self.__drawn_state = None
         self.__board = None
         self.__speed = 5
         self.__is_moving = False
@@ -160,7 +166,8 @@ class Enemy(pygame.Surface):
     @staticmethod
     def _get_path(start_x, start_y, end_x, end_y, cell_table):
         # Columns and rows set to 0 because they are reassigned when the maze file is read
-        a = list(reversed(AStar(0, 0).solve((start_y, start_x), (end_y, end_x))[0]))
+        with Profiler.section("pathfinding"):
+            a = list(reversed(AStar(0, 0).solve((start_y, start_x), (end_y, end_x))[0]))
 
         # Reverse keys and values
         cell_table = {v: k for k, v in cell_table.items()}
@@ -196,7 +203,6 @@ class Enemy(pygame.Surface):
             self.__is_moving = False
 
     def update(self, closest_player: Player, cur_pos: tuple, player_pos: tuple, cell_table: dict, board: Board):
-        self.fill((0, 0, 0, 0))
         self.__board = board
         if self.__size != "large":
             mv_info = self.__find_path(*cur_pos, *player_pos, cell_table, closest_player)
@@ -205,13 +211,16 @@ class Enemy(pygame.Surface):
                 self.x += mv_info[0]
                 self.y += mv_info[1]
 
-        # Rotates enemy image towards player
+        # Rotates enemy image towards player, only redrawn if the frame or health changed
         degrees = math.degrees(math.atan2(self.x - closest_player.x, self.y - closest_player.y))
-        rotated_img = pygame.transform.rotate(self.__img, degrees)
-        self.blit(rotated_img, (self.__width // 2, self.__height // 2))
+        rotated_img = self.__rotations.get(degrees)
+        if (rotated_img, self.__health) != self.__drawn_state:
+            self.fill((0, 0, 0, 0))
+            self.blit(rotated_img, (self.__width // 2, self.__height // 2))
 
-        # Draw health indicator
-        pygame.draw.rect(self, self.__colour_grad[self.__health - 1], (0, 0, (self.__width * 2) * (self.__health / self.__max_health), self.__height // 10))
+            # Draw health indicator
+            pygame.draw.rect(self, self.__colour_grad[self.__health - 1], (0, 0, (self.__width * 2) * (self.__health / self.__max_health), self.__height // 10))
+            self.__drawn_state = (rotated_img, self.__health)
 
         # Damage cooldown
         if self.__damage_cooldown > 0:
@@ -223,7 +232,7 @@ class Enemy(pygame.Surface):
         :return: Tuple of (x, y, item, xp)
         """
         # Gets random number with bounds [1, 101)
-        rng = randbelow(100) + 1
+        rng = RNG.stream("loot").randint(1, 100)
         for loot, chance in sorted(DataLoader.loot_table[self.__size]["drops"].items(), key=lambda x: x[1]):
             if rng <= chance:
                 return self.x, self.y, Item(loot), DataLoader.loot_table[self.__size]["xp"]
@@ -244,6 +253,7 @@ class MediumEnemy(Enemy):
     def __init__(self, x, y):
         super().__init__(x, y, "medium")
         self.__speed = 4
+        # Arguments for Projectiles.spawn, collected by the game loop each frame
         self.bullets = []
 
     def update(self, closest_player: Player, cur_pos: tuple, player_pos: tuple, cell_table: dict, board: Board):
@@ -251,14 +261,12 @@ class MediumEnemy(Enemy):
         super().update(closest_player, cur_pos, player_pos, cell_table, board)
 
         # Attack behaviour
-        if randint(1, 10) == 10:
-            self.bullets.append(
-                Bullet(
-                    self.x + self.width - board.x, self.y + self.height - board.y,
-                    closest_player.x + closest_player.width - board.x, closest_player.y + closest_player.height - board.y,
-                    DataLoader.possible_items["medium_enemy_weapon"]
-                )
-            )
+        if RNG.stream("ai").randint(1, 10) == 10:
+            self.bullets.append((
+                self.x + self.width, self.y + self.height,
+                closest_player.x + closest_player.width, closest_player.y + closest_player.height,
+                DataLoader.possible_items["medium_enemy_weapon"]
+            ))
 
 
 class LargeEnemy(Enemy):
@@ -284,14 +292,14 @@ class LargeEnemy(Enemy):
         next_cell = board.cell_pos[path[1 if len(path) > 2 else 0][1]][path[1 if len(path) > 2 else 0][0]]
 
         # New x and y pos in the middle of the cell
-        new_x = (next_cell.x + board.x + (next_cell.w // 2) - self.width)
-        new_y = (next_cell.y + board.y + (next_cell.h // 2) - self.height)
+        new_x = (next_cell.x + (next_cell.w // 2) - self.width)
+        new_y = (next_cell.y + (next_cell.h // 2) - self.height)
 
         # Only change x and y if there isn't a large enemy already in there
         self.x, self.y = (new_x, new_y) if (new_x, new_y) not in self.l_enemy_pos else (self.x, self.y)
 
         # Spawn small enemy
-        if randint(1, 25) == 25:
+        if RNG.stream("ai").randint(1, 25) == 25:
             self.spawned_enemies.append(SmallEnemy.from_large_enemy(self))
 
 
@@ -312,6 +320,13 @@ class MeleeSwing(pygame.Surface):
         self.swing_pos = (0, 0)
         self.__owner = owner
         self.__frame_num = 0
+        # The arc is drawn around the edge of the surface, which is a circle
+        self.__radius = self.__width / 2
+        # Step the arc grows by each frame, in radians
+        self.__sweep_step = math.radians(4)
+        self.__swept = None
+        # Enemies the current swing has already hit, so each one only takes the item's damage once per swing
+        self.hit = set()
         self.left = 0
         self.right = 0
         self.x = 0
@@ -325,12 +340,23 @@ class MeleeSwing(pygame.Surface):
     def height(self):
         return self.__height
 
+    @property
+    def sector(self):
+        """
+        Part of the circle the arc swept through in the last update, angles are anticlockwise from the right like pygame.draw.arc
+        :return: (centre x, centre y, radius, start angle, end angle) in board coordinates, None if it didn't swing
+        """
+        if self.__swept is None:
+            return None
+        return self.x + self.__radius, self.y + self.__radius, self.__radius, *self.__swept
+
     def update(self) -> None:
         """
         Updates the MeleeSwing surface
         :return: None
         """
         self.fill((0, 0, 0, 0))
+        self.__swept = None
 
         if self.swing:
             # Counts frames
@@ -346,6 +372,9 @@ class MeleeSwing(pygame.Surface):
             # Increment left angle by the frame num * 4, this makes the arc swipe left to right
             self.right = math.radians(math.degrees(self.left) + (self.__frame_num * 4))
 
+            # Only the part the arc grew into this frame can hit, so an enemy is hit as the arc passes over it
+            self.__swept = (self.right - self.__sweep_step, self.right)
+
             # Draw the arc to the surface and set width to frame num to allow it to enlarge over time
             pygame.draw.arc(
                 self, (255, ((255 // 15) * (15 - self.__frame_num)), ((255 // 15) * (15 - self.__frame_num))),
@@ -356,68 +385,7 @@ class MeleeSwing(pygame.Surface):
         if self.__frame_num >= 15:
             self.__frame_num = 0
             self.swing = False
-
-
-class Bullet(pygame.Rect):
-    def __init__(self, origin_x, origin_y, target_x, target_y, weapon):
-        super().__init__(origin_x, origin_y, weapon["proj_size"], weapon["proj_size"])
-        self.x = origin_x
-        self.y = origin_y
-        self.__target_x = target_x
-        self.__target_y = target_y
-        self.__origin_x = origin_x
-        self.__origin_y = origin_y
-        self.__width = weapon["proj_size"]
-        self.__height = weapon["proj_size"]
-        self.__circle_radius = weapon["proj_dist"]
-        self.damage = weapon["damage"]
-        self.colour = tuple(weapon["colour"])
-        self.moving = True
-        self.from_enemy = True if weapon["item_type"] == "enemy_weapon" else False
-
-        # Create circle function in form (x - center_x)^2 + (y - center_y)^2 = radius^2
-        self.circle_eq = lambda x, y: (x - self.__origin_x) ** 2 + (y - self.__origin_y) ** 2
-
-        # Calculate Euclidean distance from target pos to player pos
-        #     _____________________________
-        #    /
-        #   /  (x2 - x1)^2 + (y2 - y1)^2
-        # \/
-        dist = math.sqrt((target_x - self.__origin_x) ** 2 + (target_y - self.__origin_y) ** 2)
-
-        # Calculate the number of times the line can be divided by the speed
-        self.__num_of_divisions = dist / (MAX_BULLET_SPEED * (weapon["proj_speed"] / 100))
-        self.__cur_div = 1
-
-    def update(self, dt: float) -> None:
-        """
-        Updates the Bullet class
-        To move the bullet this equation is used:
-            (x, y) = (x1 + k(x2 - x1), y1 + k(y2 - y1))
-
-            where (x1, y1) is the start point,
-                  (x2, y2) is the endpoint,
-                  k is the fraction of the line you want to divide
-        :param dt: Delta time
-        :return: None
-        """
-        # Checks if (x - center_x)^2 + (y - center_y)^2 < radius^2
-        # and if so then the bullet is still within the circle and can be drawn and moved
-        if self.circle_eq(self.x, self.y) < self.__circle_radius ** 2:
-
-            new_x = self.__origin_x + ((self.__cur_div / self.__num_of_divisions) * (self.__target_x - self.__origin_x))
-            new_y = self.__origin_y + ((self.__cur_div / self.__num_of_divisions) * (self.__target_y - self.__origin_y))
-
-            # Scale using delta time
-            scaled_x = (new_x - self.x) * dt
-            scaled_y = (new_y - self.y) * dt
-
-            self.x += scaled_x
-            self.y += scaled_y
-
-            self.__cur_div += 1
-        else:
-            self.moving = False
+            self.hit.clear()
 
 
 @dataclass
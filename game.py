@@ -0,0 +1,575 @@
+import pygame
+from ui import Hotbar, Inventory, Inspector, Equipment, Attributes, Tab, HealthBar, ManaBar, XPBar, SkillTree, ItemDropDisplay, Menu, ProfilerOverlay
+from board import Board
+from entities import Player, SmallEnemy, MediumEnemy, LargeEnemy, MeleeSwing, Bezier
+from data_loader import DataLoader
+from maze_creator import MazeCreator
+from constants import *
+from utils import inv_collide, eq_collide, st_collide, sector_rect_collide, bullet_collide, kill_enemy
+from renderer import DirtyRects, TextCache, RenderQueue, AnimationClip
+from asset_manager import AssetManager
+from projectiles import Projectiles
+from camera import Camera
+from timestep import FixedTimestep, Interpolator
+from profiler import Profiler
+from cell_index import CellIndex
+from rng import RNG
+
+
+class Game:
+    """
+    The game and its main loop, one call to frame() handles input, runs the simulation steps that are due
+    and draws the result, so the loop can be driven by run() or by something else such as the benchmark
+    """
+    ENEMY_TYPES = {"small": SmallEnemy, "medium": MediumEnemy, "large": LargeEnemy}
+
+    def __init__(self, player_name: str, maze_size: int=10, enemies: dict=None, seed: int=None):
+        """
+        :param player_name: Name of the player in the player data file
+        :param maze_size: Width and height of the maze grid, the maze has maze_size // 2 cells along each side
+        :param enemies: Number of each enemy type to start with, e.g {"large": 2}
+        :param seed: Seed for the maze, doors, enemy placement, enemy AI and loot, random if None
+        """
+        RNG.seed(seed)
+
+        pygame.init()
+        self.width, self.height = WINDOW_WIDTH, WINDOW_HEIGHT
+        self.display = pygame.display.set_mode((self.width, self.height), pygame.HWSURFACE | pygame.DOUBLEBUF)
+        self.clock = pygame.time.Clock()
+        self.dirty_rects = DirtyRects(self.display.get_rect())
+        self.render_queue = RenderQueue()
+
+        # Player name is set as class attribute rather than instance
+        # DataLoader then created to call __init__ to load the player data
+        DataLoader.player_name = player_name
+        _ = DataLoader()
+
+        # Create new maze
+        self.maze = MazeCreator(maze_size, maze_size)
+        self.maze.create((0, 0))
+        cells = maze_size // 2
+
+        # Create all game surfaces
+        self.hotbar = Hotbar()
+        self.inv = Inventory()
+        self.inspector = Inspector()
+        self.tab = Tab()
+        self.equipment = Equipment()
+        self.attributes = Attributes()
+        self.xp_bar = XPBar()
+        self.item_drop_display = ItemDropDisplay()
+        self.profiler_overlay = ProfilerOverlay()
+        board_size = cells * (CELL_WIDTH + WALL_VERTICAL_WIDTH) + WALL_VERTICAL_WIDTH
+        self.board = Board(board_size, board_size)
+        self.camera = Camera(self.board.width, self.board.height)
+        # Camera position drawn this frame, between the simulation camera's last two positions
+        self.view = Camera(self.board.width, self.board.height)
+        self.st = SkillTree(self.width, self.height)
+        self.menu = Menu([
+            ("Resume", lambda: setattr(self, "show_menu", False)),
+            ("Help", lambda: None),
+            ("Quit", lambda: setattr(self, "running", False))
+        ])
+
+        # Create entities
+        self.player = Player()
+        spawn_rng = RNG.stream("spawn")
+        self.enemies = [
+            self.ENEMY_TYPES[size]((380 * spawn_rng.randint(1, cells)) - 190, (380 * spawn_rng.randint(1, cells)) - 190)
+            for size, amount in ({"large": 2} if enemies is None else enemies).items() for _ in range(amount)
+        ]
+        self.melee_swing = MeleeSwing(self.player, self.hotbar[self.hotbar.selected_pos][1])
+
+        # Enemies and item drops bucketed by maze cell, so collisions with them only check the ones nearby
+        self.enemy_index = CellIndex()
+        for enemy in self.enemies:
+            self.enemy_index.insert(enemy, self.__collision_rect(enemy))
+        self.drop_index = CellIndex()
+
+        # Load the pickup animations up front so dropping an item never touches the disk
+        for rarity, frame_amount in ITEM_DROP_FRAME_AMOUNT.items():
+            AnimationClip.load(rarity, frame_amount)
+
+        self.healthbar = HealthBar(self.player.health)
+        self.manabar = ManaBar(self.player.mana)
+
+        # Misc Variables
+        self.font = pygame.font.SysFont("Courier", 15, True)
+        self.running = True
+        self.show_inv = False
+        self.show_equipment = True
+        self.show_st = False
+        self.show_menu = False
+        self.show_profiler = False
+        self.inspect_name = None
+        self.inspect_data = None
+        self.mouse_pos = (0, 0)
+        self.mouse_pressed = (False, False, False)
+        self.mx, self.my = 0, 0
+        self.go_right, self.go_left, self.go_up, self.go_down, = False, False, False, False
+        self.num_pos = {pygame.K_1: 1, pygame.K_2: 2, pygame.K_3: 3, pygame.K_4: 4, pygame.K_5: 5}
+        self.mid_screen = pygame.Rect(0, (self.height // 2) - 200, self.width, self.height // 2)
+        self.item_drops = []
+        self.projectiles = Projectiles()
+        self.timestep = FixedTimestep()
+        self.interpolator = Interpolator()
+        # Milliseconds the game has been told have passed, animations are timed with this instead of the real clock
+        self.time = 0
+
+    def run(self) -> None:
+        """
+        Plays the game in the window until the player quits or dies
+        :return: None
+        """
+        pygame.mouse.set_cursor(*pygame.cursors.broken_x)
+        while self.frame(self.clock.tick(MAX_FRAME_RATE)):
+            pass
+        pygame.quit()
+
+    def frame(self, ms: float, events: list=None, mouse: tuple=None) -> bool:
+        """
+        Runs one iteration of the game loop
+        :param ms: Real time since the last frame, the simulation catches up with it in fixed steps
+        :param events: Events to handle, defaults to the pygame event queue
+        :param mouse: (position, pressed buttons) to use instead of the real mouse
+        :return: True while the game is still running
+        """
+        Profiler.start_frame()
+
+        self.mouse_pos, self.mouse_pressed = (pygame.mouse.get_pos(), pygame.mouse.get_pressed()) if mouse is None else mouse
+        self.mx, self.my = self.mouse_pos
+        for event in pygame.event.get() if events is None else events:
+            self.handle_event(event)
+        self.__inspect()
+        Profiler.lap("events")
+
+        # Run the simulation in fixed steps, everything after this only draws
+        self.time += ms
+        for _ in range(self.timestep.advance(ms)):
+            self.step()
+
+        # Positions are drawn part way between the last two simulation steps so movement is smooth at any frame rate
+        self.draw(self.timestep.alpha)
+        Profiler.end_frame()
+        return self.running and self.player.health > 0
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        """
+        Handles a single key, mouse or window event
+        :param event: The event
+        :return: None
+        """
+        if event.type == pygame.QUIT:
+            self.running = False
+
+        if event.type == pygame.KEYDOWN:
+            # Toggles pause
+            if event.key == pygame.K_ESCAPE:
+                self.show_menu = not self.show_menu
+                self.show_inv = False
+                self.show_st = False
+
+            # Toggles inventory
+            elif event.key == pygame.K_e and not self.show_menu:
+                self.show_inv = not self.show_inv
+                self.show_st = False
+
+            # Switches tabs
+            elif event.key == pygame.K_i and not self.show_menu:
+                self.show_equipment = not self.show_equipment
+                self.tab.selected_equipment = not self.tab.selected_equipment
+
+            # Toggles skill tree
+            elif event.key == pygame.K_k and not self.show_menu:
+                self.show_st = not self.show_st
+                self.show_inv = False
+
+            # Toggles profiler overlay
+            elif event.key == pygame.K_F3:
+                self.show_profiler = not self.show_profiler
+
+            # Adds xp to player -------------------------------------------------- Dev tool
+            elif event.key == pygame.K_x:
+                DataLoader.change_file("add_xp", 1)
+
+            # Moves item from inv to hotbar
+            elif event.key in [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_5] and not self.show_menu:
+                if self.show_inv:
+                    inv_collide_data = inv_collide(self.inv, *self.mouse_pos)
+                    if inv_collide_data is not None:
+                        pos, space = inv_collide_data
+                        DataLoader.change_file("remove_from_hotbar", self.num_pos[event.key] - 1)
+                        DataLoader.change_file("add_to_hotbar", space[0][1], self.num_pos[event.key] - 1)
+                        DataLoader.change_file("remove_from_inv", pos)
+                        DataLoader.change_file("add_to_inv", self.hotbar[self.num_pos[event.key] - 1][1], pos)
+
+            # Movement keys
+            elif event.key == pygame.K_d and not self.show_menu:
+                self.go_right = True
+            elif event.key == pygame.K_a and not self.show_menu:
+                self.go_left = True
+            elif event.key == pygame.K_w and not self.show_menu:
+                self.go_up = True
+            elif event.key == pygame.K_s and not self.show_menu:
+                self.go_down = True
+
+        if event.type == pygame.KEYUP and not self.show_menu:
+            if event.key == pygame.K_d:
+                self.go_right = False
+            elif event.key == pygame.K_a:
+                self.go_left = False
+            elif event.key == pygame.K_w:
+                self.go_up = False
+            elif event.key == pygame.K_s:
+                self.go_down = False
+
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:
+                if self.show_inv:
+                    self.mx, self.my = self.mouse_pos
+                    # Changing attribute tab
+                    for pos, sect in enumerate(self.tab):
+                        rect = pygame.Rect(sect.x, self.tab.height * 2 + sect.y, sect.w, sect.h)
+                        if rect.collidepoint(self.mx, self.my):
+                            self.tab.selected_equipment = True if pos == 0 else False
+                            self.show_equipment = True if pos == 0 else False
+
+                    # Changing attribute numbers
+                    for pos, signs in enumerate(self.attributes):
+                        plus, minus = signs
+                        p = pygame.Rect(plus.x, (self.height // 2 - (self.attributes.height // 2)) + plus.y, plus.w, plus.h)
+                        m = pygame.Rect(minus.x, (self.height // 2 - (self.attributes.height // 2)) + minus.y, minus.w, minus.h)
+                        if p.collidepoint(self.mx, self.my):
+                            DataLoader.change_file("increment_attr", list(DataLoader.player_data["attributes"])[pos], 1)
+                        if m.collidepoint(self.mx, self.my):
+                            DataLoader.change_file("increment_attr", list(DataLoader.player_data["attributes"])[pos], -1)
+
+                if self.show_menu:
+                    self.menu.check_pressed(*self.mouse_pos)
+
+            # Switch armor for current selected using right mouse
+            elif event.button == 3:
+                if self.show_inv:
+                    inv_collide_data = inv_collide(self.inv, *self.mouse_pos)
+                    if inv_collide_data is not None:
+                        pos, space = inv_collide_data
+                        for i_pos, tup in enumerate(self.inv):
+                            if tup[1] == space[1] and DataLoader.possible_items[tup[0][1]]["item_type"] == "armor":
+                                armor_type = DataLoader.possible_items[tup[0][1]]["armor_type"]
+                                DataLoader.change_file("remove_from_inv", i_pos)
+                                DataLoader.change_file("add_to_inv", DataLoader.player_data["armor"][armor_type], i_pos)
+                                DataLoader.change_file("remove_from_armor", armor_type)
+                                DataLoader.change_file("add_to_armor", armor_type, tup[0][1])
+
+            elif event.button == 4:
+                self.hotbar.change_selected(-1)
+            elif event.button == 5:
+                self.hotbar.change_selected(1)
+
+    def __inspect(self) -> None:
+        """
+        Mouse collision to provide the inspector with data
+        :return: None
+        """
+        if self.show_inv and not self.show_menu:
+            inv_collide_data = inv_collide(self.inv, *self.mouse_pos)
+            if inv_collide_data is not None:
+                pos, space = inv_collide_data
+                self.inspect_name = space[0][1]
+                self.inspect_data = {
+                    "img": space[0][0],
+                    "attr": DataLoader.possible_items[space[0][1]],
+                    "inv_pos": pos,
+                    "eq_pos": None,
+                    "st_pos": None
+                }
+
+            if self.show_equipment:
+                eq_collide_data = eq_collide(self.equipment, *self.mouse_pos)
+                if eq_collide_data is not None:
+                    pos, slot = eq_collide_data
+                    self.inspect_name = slot[0][1]
+                    self.inspect_data = {
+                        "img": slot[0][0],
+                        "attr": DataLoader.possible_items[slot[0][1]],
+                        "eq_pos": pos,
+                        "inv_pos": None,
+                        "st_pos": None
+                    }
+        if self.show_st and not self.show_menu:
+            st_collide_data = st_collide(self.st, *self.mouse_pos)
+            if st_collide_data is not None:
+                skill, rect, img = st_collide_data
+                self.inspect_name = skill["elem"].tag
+                self.inspect_data = {
+                    "img": img,
+                    "attr": {**skill["elem"].attrib, "level": DataLoader.player_data["skills"].get(self.inspect_name)},
+                    "eq_pos": None,
+                    "inv_pos": None,
+                    "st_pos": rect
+                }
+
+    @staticmethod
+    def __collision_rect(entity) -> pygame.Rect:
+        """
+        Entities are drawn to surfaces twice their size so the rect used for collisions is in the middle
+        :param entity: Player or enemy
+        :return: Collision rect in board coordinates
+        """
+        return pygame.Rect(entity.x + (entity.width // 2), entity.y + (entity.height // 2), entity.width, entity.height)
+
+    def step(self) -> None:
+        """
+        Advances the simulation by one fixed step
+        :return: None
+        """
+        self.interpolator.snapshot([self.camera, self.player, self.melee_swing, *self.enemies])
+
+        # Player movement
+        if not self.show_inv and not self.show_menu:
+            dx = (self.go_right - self.go_left) * self.player.mv_amount
+            dy = (self.go_down - self.go_up) * self.player.mv_amount
+            if dx or dy:
+                new_x, new_y = self.board.move(self.player, dx, dy)
+                # Everything stays in world coordinates, the camera follows the player while they are in the middle of the screen
+                if self.mid_screen.collidepoint(self.camera.to_screen(self.player.x, self.player.y)):
+                    self.camera.scroll(new_x - self.player.x, 0)
+                    self.camera.scroll(0, new_y - self.player.y)
+                self.player.x, self.player.y = new_x, new_y
+        Profiler.lap("collision")
+
+        player_cell_y, player_cell_x = self.board.cell_collide(self.player)
+        player_puz_x, player_puz_y = self.maze.cell_table[player_cell_x, player_cell_y]
+
+        # Item drop pickup
+        player_rect = pygame.Rect(self.player.x, self.player.y, self.player.width, self.player.height)
+        for it_dr in self.drop_index.query(player_rect):
+            item_rect = pygame.Rect(it_dr.x, it_dr.y, it_dr.width, it_dr.height)
+            if player_rect.colliderect(item_rect):
+                next_slot = DataLoader.get_next_open_inv_slot()
+                if next_slot is not None:
+                    DataLoader.change_file("remove_from_inv", next_slot)
+                    DataLoader.change_file("add_to_inv", it_dr.item.name, next_slot)
+                    self.item_drop_display.add_item((it_dr.item.name, AssetManager.get(it_dr.item.name)))
+                    self.item_drops.remove(it_dr)
+                    self.drop_index.remove(it_dr)
+
+        if not self.show_menu:
+            for button, pressed in enumerate(self.mouse_pressed):
+                if button == 0 and pressed == 1:
+                    cur_item = DataLoader.possible_items[self.hotbar[self.hotbar.selected_pos][1]]
+                    if not self.show_inv and not self.show_st and not self.show_menu:
+                        if cur_item.get("melee_speed") is not None:
+                            speed = cur_item["melee_speed"]
+                            damage = cur_item["damage"]
+                            if self.player.melee_cooldown >= (60 * (1 - (speed / 100))):
+                                self.player.melee_cooldown = 0
+                                self.melee_swing.swing = True
+                                self.melee_swing.swing_pos = self.camera.to_world(*self.mouse_pos)
+
+                        elif cur_item.get("proj_dist") is not None:
+                            if cur_item.get("mana_used") is not None:
+                                if self.player.mana - cur_item["mana_used"] >= 0:
+                                    # player.mana -= cur_item["mana_used"]
+                                    self.projectiles.spawn(self.player.x + self.player.width, self.player.y + self.player.height, *self.camera.to_world(self.mx, self.my), cur_item)
+                            else:
+                                # Arrow
+                                pass
+
+            # Melee hits, from the part of the circle the swing moved through last update
+            # An enemy spans several updates' slices, so it is only damaged by the first one that reaches it,
+            # one still on damage cooldown isn't marked as hit so a later slice can still damage it
+            melee_sector = self.melee_swing.sector
+            if melee_sector is not None:
+                damage = DataLoader.possible_items[self.melee_swing.item]["damage"]
+                cx, cy, radius = melee_sector[:3]
+                reach = pygame.Rect(cx - radius, cy - radius, radius * 2, radius * 2)
+                for e in self.enemy_index.query(reach):
+                    if e not in self.melee_swing.hit and sector_rect_collide(melee_sector, self.__collision_rect(e)):
+                        health = e.health
+                        e.health -= damage
+                        if e.health != health:
+                            self.melee_swing.hit.add(e)
+
+        # Kill enemy if health < 1, the dead are found first as killing one shifts the ones after it
+        for e in [e for e in self.enemies if e.health < 1]:
+            self.enemy_index.remove(e)
+            edrps = kill_enemy(self.enemies, self.enemies.index(e), self.item_drops, self.time)
+            if edrps is not None:
+                self.item_drops = edrps
+                # The new drop is added to the end of the list
+                it_dr = self.item_drops[-1]
+                self.drop_index.insert(it_dr, pygame.Rect(it_dr.x, it_dr.y, it_dr.width, it_dr.height))
+
+        self.player.melee_cooldown += 1
+
+        Profiler.lap("gameplay")
+
+        # Update enemies
+        if not self.show_menu:
+            for enemy in self.enemies:
+                r, c = self.board.cell_collide(enemy)
+                puz_x, puz_y = self.maze.cell_table[c, r]
+
+                if isinstance(enemy, LargeEnemy):
+                    # Large enemies only move into a neighbouring cell so only large enemies nearby can be in the way
+                    enemy.l_enemy_pos = [(i.x, i.y) for i in self.enemy_index.query_cell(c, r, 1) if isinstance(i, LargeEnemy)]
+                    if enemy.spawned_enemies:
+                        self.enemies.extend(enemy.spawned_enemies)
+                        for spawned in enemy.spawned_enemies:
+                            self.enemy_index.insert(spawned, self.__collision_rect(spawned))
+                        enemy.spawned_enemies = []
+
+                    sml_enemies = [(i.x + i.width, i.y + i.height) for i in self.enemies if isinstance(i, SmallEnemy) and i.origin == 1]
+                    enemy.bezier_points = Bezier([(enemy.x + enemy.width, enemy.y + enemy.height)] + sml_enemies[:len(sml_enemies) if len(sml_enemies) < 4 else 4] + [(self.player.x + self.player.width, self.player.y + self.player.height)], 100).get_points()
+
+                enemy.update(self.player, (puz_x, puz_y), (player_puz_x, player_puz_y), self.maze.cell_table, self.board)
+                self.enemy_index.move(enemy, self.__collision_rect(enemy))
+
+                if isinstance(enemy, MediumEnemy):
+                    for bullet in enemy.bullets:
+                        self.projectiles.spawn(*bullet)
+                    enemy.bullets = []
+
+        Profiler.lap("enemies")
+
+        # Collide and move bullets, all bullets are moved and removed together and stay still while paused
+        # Bullets which would hit a wall during the move are removed before they are drawn inside or past it
+        if not self.show_menu:
+            for i, rect, owner, damage, dx, dy in self.projectiles.rects(1):
+                if bullet_collide(rect, owner == Projectiles.ENEMY, damage, self.board, self.player, self.enemy_index.query(rect), dx, dy):
+                    self.projectiles.kill(i)
+        self.projectiles.update(0 if self.show_menu else 1)
+
+        Profiler.lap("bullets")
+
+        # Player rotation, damage cooldown and level up
+        self.player.update(*self.camera.to_world(self.mx, self.my))
+
+        # Melee swing animation, it is positioned around the player so it is moved after them
+        if self.hotbar[self.hotbar.selected_pos][1] != self.melee_swing.item:
+            self.melee_swing = MeleeSwing(self.player, self.hotbar[self.hotbar.selected_pos][1])
+        self.melee_swing.update()
+        p_rect = pygame.Rect(self.player.x + (self.player.width // 2), self.player.y + (self.player.height // 2), self.player.width, self.player.height)
+        self.melee_swing.x = p_rect.centerx - (self.melee_swing.width // 2)
+        self.melee_swing.y = p_rect.centery - (self.melee_swing.height // 2)
+
+        Profiler.lap("gameplay")
+
+    def draw(self, alpha: float) -> None:
+        """
+        Draws the game and updates the changed parts of the window
+        :param alpha: How far between the last two simulation steps moving objects are drawn, from FixedTimestep.alpha
+        :return: None
+        """
+        self.view.x, self.view.y = self.interpolator.get(self.camera, alpha)
+
+        # Update board surface, the board covers the whole display so it doesn't need to be filled first
+        # If the board scrolled then every part of the display has changed
+        if self.board.update(self.view.rect):
+            self.dirty_rects.invalidate_all()
+        self.dirty_rects.extend(self.board.changed_rects)
+        self.render_queue.blit(LAYER_BOARD, self.board, (0, 0), key=self.board, changed=False)
+
+        Profiler.lap("board")
+
+        # Draw item drops to screen, drops outside of the window aren't animated or drawn
+        for it_dr in self.item_drops:
+            if self.view.in_view((it_dr.x, it_dr.y, it_dr.width, it_dr.height)):
+                it_dr.update(self.time)
+                self.render_queue.blit(LAYER_ITEM_DROPS, it_dr, self.view.to_screen(it_dr.x, it_dr.y))
+
+        # Draw large enemy paths
+        for enemy in self.enemies:
+            if isinstance(enemy, LargeEnemy) and enemy.bezier_points:
+                for point in enemy.bezier_points:
+                    if self.view.in_view((point[0] - 2, point[1] - 2, 4, 4)):
+                        self.render_queue.circle(LAYER_PATHS, BEZIER_POINT_COLOUR, self.view.to_screen(*point), 2)
+
+        # Draw bullets
+        for rect, colour in self.projectiles.get_visible(self.view.rect, alpha):
+            self.render_queue.fill(LAYER_BULLETS, colour, self.view.apply(rect))
+
+        # Draw enemies to screen
+        for enemy in self.enemies:
+            self.render_queue.blit(LAYER_ENEMIES, enemy, self.view.to_screen(*self.interpolator.get(enemy, alpha)), key=enemy)
+
+        # Draw player to screen
+        self.render_queue.blit(LAYER_PLAYER, self.player, self.view.to_screen(*self.interpolator.get(self.player, alpha)), key=self.player)
+
+        # Draw melee swing to screen
+        self.render_queue.blit(LAYER_EFFECTS, self.melee_swing, self.view.to_screen(*self.interpolator.get(self.melee_swing, alpha)), key="melee_swing")
+
+        Profiler.lap("sprites")
+
+        # Update hotbar surface and draw to screen
+        hotbar_changed = self.hotbar.update()
+        self.render_queue.blit(LAYER_HUD, self.hotbar, (self.width // 3, self.height - self.hotbar.height), key=self.hotbar, changed=hotbar_changed)
+
+        # Update health bar surface and draw to screen
+        healthbar_changed = self.healthbar.update(self.font, self.player.health)
+        self.render_queue.blit(LAYER_HUD, self.healthbar, (self.width // 20, self.height - (self.hotbar.height - self.hotbar.height // 4)), key=self.healthbar, changed=healthbar_changed)
+
+        # Update mana bar surface and draw to screen
+        manabar_changed = self.manabar.update(self.font, self.player.mana)
+        self.render_queue.blit(LAYER_HUD, self.manabar, ((self.width // 20) * 15, self.height - (self.hotbar.height - self.hotbar.height // 4)), key=self.manabar, changed=manabar_changed)
+
+        # Update item drop display and draw to screen
+        item_drop_display_changed = self.item_drop_display.update(self.font)
+        self.render_queue.blit(LAYER_HUD, self.item_drop_display, (self.width - self.item_drop_display.width, self.height // 2 - (self.item_drop_display.height // 1.5)), key=self.item_drop_display, changed=item_drop_display_changed)
+
+        # Update inventory surface and draw to screen
+        if self.show_inv:
+            self.inv.update(self.inspect_data)
+            self.render_queue.blit(LAYER_PANELS, self.inv, (self.width // 2 - (self.inv.width // 2), self.height // 2 - (self.inv.height // 2)), key=self.inv)
+
+        # Update inspector if inventory or skill tree is open
+        if self.show_inv or self.show_st:
+            self.inspector.update(self.inspect_name, self.font, self.inspect_data)
+            self.render_queue.blit(LAYER_PANELS, self.inspector, (self.width - self.inspector.width, self.height // 2 - (self.inspector.height // 2)), key=self.inspector)
+
+        # Update equipment if inventory is open and equipment is selected
+        if self.show_inv and self.show_equipment:
+            self.equipment.update(self.font, self.inspect_data)
+            self.render_queue.blit(LAYER_PANELS, self.equipment, (0, self.height // 2 - (self.equipment.height // 2)), key=self.equipment)
+
+        # Update attributes if inventory is open and attributes is selected
+        if self.show_inv and not self.show_equipment:
+            self.attributes.update(self.font)
+            self.render_queue.blit(LAYER_PANELS, self.attributes, (0, self.height // 2 - (self.attributes.height // 2)), key=self.attributes)
+
+        # Update tab if inventory is open
+        if self.show_inv:
+            self.tab.update(self.font)
+            self.render_queue.blit(LAYER_PANELS, self.tab, (0, self.height // 2 - (self.attributes.height // 2)), key=self.tab)
+
+        # Update XP bar if inventory is open
+        if self.show_inv:
+            xp_bar_changed = self.xp_bar.update(self.font)
+            self.render_queue.blit(LAYER_PANELS, self.xp_bar, (self.width // 2 - (self.inv.width // 2), self.height // 2 - (self.inv.height // 2) - self.xp_bar.height), key=self.xp_bar, changed=xp_bar_changed)
+
+        # Update skill tree surface
+        if self.show_st:
+            self.st.update(self.font, self.inspect_data)
+            self.render_queue.blit(LAYER_PANELS, self.st, (0, self.height // 2 - (self.st.height // 2)), key=self.st)
+
+        # Pause menu
+        if self.show_menu:
+            self.menu.update(self.font, *self.mouse_pos)
+            self.render_queue.blit(LAYER_MENU, self.menu, (self.menu.x, self.menu.y), key=self.menu)
+
+        # Draw fps counter
+        fps_txt = TextCache.render_glyphs(self.font, str(round(self.clock.get_fps(), 0)), True, (0, 255, 0))
+        self.render_queue.blit(LAYER_OVERLAY, fps_txt, (0, 0), key="fps")
+
+        # Draw profiler overlay
+        if self.show_profiler:
+            profiler_overlay_changed = self.profiler_overlay.update(self.font)
+            self.render_queue.blit(LAYER_OVERLAY, self.profiler_overlay, (0, self.font.get_linesize()), key=self.profiler_overlay, changed=profiler_overlay_changed)
+        Profiler.lap("hud")
+
+        # Draw everything in layer order and update only the parts of the screen which changed
+        self.render_queue.draw(self.display, self.dirty_rects)
+        Profiler.lap("draw")
+        self.dirty_rects.update()
+        Profiler.lap("flip")
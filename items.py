@@ -1,6 +1,8 @@
 import pygame
 from data_loader import DataLoader
 from constants import *
+from asset_manager import AssetManager
+from renderer import AnimationClip
 
 
 class Item:
@@ -18,19 +20,17 @@ class Item:
 
 
 class ItemDrop(pygame.Surface):
-    def __init__(self, x, y, item):
+    def __init__(self, x, y, item, start_time: float=0):
         self.__width = int((WINDOW_HEIGHT / 720) * ITEM_DROP_WIDTH)
         self.__height = int((WINDOW_HEIGHT / 720) * ITEM_DROP_HEIGHT)
         super().__init__((self.__width, self.__height), pygame.SRCALPHA)
         self.x = x
         self.y = y
         self.item = item
-        self.image = pygame.image.load(f"{MAIN_ASSET_PATH}{item.name}.png")
-        self.__pickup_frames = iter([
-            pygame.image.load(f"{MAIN_ASSET_PATH}{item.data['rarity']}_{i}.png")
-            for i in range(1, ITEM_DROP_FRAME_AMOUNT[item.data["rarity"]] + 1)
-        ])
-        self.__play_animation = True
+        self.image = AssetManager.get(item.name)
+        self.__clip = AnimationClip.load(item.data["rarity"], ITEM_DROP_FRAME_AMOUNT[item.data["rarity"]])
+        self.__start_time = start_time
+        self.__drawn_frame = None
 
     @property
     def width(self):
@@ -40,14 +40,17 @@ class ItemDrop(pygame.Surface):
     def height(self):
         return self.__height
 
-    def update(self):
+    def update(self, time: float) -> bool:
+        """
+        Draws the pickup animation frame for the current time, then the item image once the animation has finished
+        :param time: Game time in milliseconds, the same clock the drop's start time was taken from
+        :return: True if the drop was redrawn
+        """
+        frame = min(self.__clip.frame_index(time - self.__start_time), len(self.__clip))
+        if frame == self.__drawn_frame:
+            return False
+        self.__drawn_frame = frame
+
         self.fill(ITEM_DROP_BACKGROUND)
-        if self.__play_animation:
-            try:
-                img = next(self.__pickup_frames)
-            except StopIteration:
-                img = self.image
-                self.__play_animation = False
-            self.blit(img, (0, 0))
-        else:
-            self.blit(self.image, (0, 0))
+        self.blit(self.__clip.get(frame) if frame < len(self.__clip) else self.image, (0, 0))
+        return True
@@ -0,0 +1,192 @@
+"""
+Times the functions the game loop spends most of its time in and prints the results as JSON
+
+    python kernel_benchmark.py --save baseline.json
+    python kernel_benchmark.py --compare baseline.json --threshold 0.1
+
+Compare mode exits with status 1 if any kernel got slower than the baseline by more than the threshold
+Fixtures are made from a fixed seed, the maze and player data files are put back afterwards
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import sys
+import math
+import json
+import random
+import argparse
+import numpy as np
+import pygame
+from timeit import Timer
+from statistics import median
+from constants import *
+from a_star import AStar
+from maze_creator import MazeCreator
+from data_loader import DataLoader
+from board import Board
+from cell_index import CellIndex
+from rng import RNG
+from entities import Player, LargeEnemy, Bezier
+from utils import line_collide, line_collide_batch, sector_rect_collide, bullet_collide, colour_lerp
+
+MAZE_SIZES = [10, 20, 30]
+SEED = 0
+
+
+def kernels():
+    """
+    Makes the fixtures for each kernel, the fixture for a kernel is only made once the previous one has
+    been timed because the maze kernels share data/maze.txt
+    :return: Iterator of (name, function to time)
+    """
+    for size in MAZE_SIZES:
+        RNG.seed(SEED)
+        MazeCreator(size, size).create((0, 0))
+        end = (size - 1 if size % 2 == 0 else size - 2,) * 2
+        yield f"a_star_solve_{size}", lambda end=end: AStar(0, 0).solve((1, 1), end)
+
+    for size in MAZE_SIZES:
+        def create(size=size):
+            RNG.seed(SEED)
+            MazeCreator(size, size).create((0, 0))
+        yield f"maze_create_{size}", create
+
+    # Board, player and enemies for the collision kernels, on the default 10x10 maze
+    RNG.seed(SEED)
+    MazeCreator(10, 10).create((0, 0))
+    board = Board(2020, 2020)
+    player = Player()
+    player.x, player.y = 1000, 1000
+    enemies = [LargeEnemy(190 + 380 * i, 190) for i in range(5)]
+    yield "board_door_collide", lambda: board.door_collide(player)
+    yield "board_wall_collide", lambda: board.wall_collide(player)
+    yield "board_cell_collide", lambda: board.cell_collide(player)
+    yield "board_move", lambda: board.move(player, PLAYER_MV_AMOUNT, PLAYER_MV_AMOUNT)
+
+    yield "line_collide_hit", lambda: line_collide((0, 0, 100, 100), (0, 100, 100, 0))
+    yield "line_collide_miss", lambda: line_collide((0, 0, 10, 10), (50, 100, 100, 50))
+    yield "line_collide_parallel", lambda: line_collide((0, 0, 100, 0), (50, 0, 150, 0))
+
+    # A melee swing's last 4 degrees against an enemy inside it and one beside it
+    swing = (1000, 1000, 100, math.radians(40), math.radians(44))
+    yield "sector_rect_collide_hit", lambda: sector_rect_collide(swing, pygame.Rect(1040, 940, 40, 40))
+    yield "sector_rect_collide_miss", lambda: sector_rect_collide(swing, pygame.Rect(1040, 1010, 40, 40))
+    yield "sector_rect_collide_out_of_reach", lambda: sector_rect_collide(swing, pygame.Rect(1200, 1200, 40, 40))
+
+    # Every one of 120 rays against every one of 10 walls, like the ray tracing demo
+    seg_rng = random.Random(SEED)
+    rays = [(500, 500, seg_rng.randint(0, 1280), seg_rng.randint(0, 720)) for _ in range(120)]
+    walls = [(seg_rng.randint(100, 1000), seg_rng.randint(100, 600), seg_rng.randint(200, 1200), seg_rng.randint(200, 700)) for _ in range(10)]
+    yield "line_collide_rays_loop", lambda: [line_collide(ray, wall) for ray in rays for wall in walls]
+    ray_array, wall_array = np.array(rays)[:, None], np.array(walls)[None, :]
+    yield "line_collide_rays_batch", lambda: line_collide_batch(ray_array, wall_array)
+
+    # A player bullet in open space has to be checked against every enemy and wall
+    bullet = pygame.Rect(1010, 1010, 5, 5)
+    yield "bullet_collide", lambda: bullet_collide(bullet, False, 1, board, player, enemies)
+    yield "bullet_collide_moving", lambda: bullet_collide(bullet, False, 1, board, player, enemies, MAX_BULLET_SPEED, MAX_BULLET_SPEED)
+    yield "board_raycast_long", lambda: board.raycast(bullet, 900, 300)
+
+    # Enemies in every cell but the bullet's, with the index the bullet only has to be checked against its own cell
+    crowd = [LargeEnemy(190 + 380 * c, 190 + 380 * r) for c in range(5) for r in range(5) if (c, r) != (2, 2) for _ in range(8)]
+    enemy_index = CellIndex()
+    for e in crowd:
+        enemy_index.insert(e, pygame.Rect(e.x + (e.width // 2), e.y + (e.height // 2), e.width, e.height))
+    yield "cell_index_query", lambda: enemy_index.query(bullet)
+    yield "bullet_collide_crowd_scan", lambda: bullet_collide(bullet, False, 0, board, player, crowd)
+    yield "bullet_collide_crowd_index", lambda: bullet_collide(bullet, False, 0, board, player, enemy_index.query(bullet))
+
+    for n in range(2, 7):
+        bezier = Bezier([(100 * i, (i % 2) * 300) for i in range(n)], 100)
+        yield f"bezier_get_points_{n}", bezier.get_points
+
+    yield "colour_lerp_50", lambda: list(colour_lerp((255, 9, 0), (0, 255, 0), 50))
+
+    yield "data_loader_change_file", lambda: DataLoader.change_file("add_xp", 0)
+
+
+def time_kernel(func, repeat: int) -> dict:
+    """
+    Times a function, the number of calls per run is picked so each run takes at least 0.2 seconds
+    :param func: Function to time
+    :param repeat: Number of runs
+    :return: Dict of median and min microseconds per call and the calls per run
+    """
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    runs = [t / number * 1e6 for t in timer.repeat(repeat, number)]
+    return {"median_us": median(runs), "min_us": min(runs), "calls": number}
+
+
+def run(repeat: int, only: str=None) -> dict:
+    """
+    Times every kernel
+    :param repeat: Number of runs of each kernel
+    :param only: Only time kernels whose name contains this
+    :return: Dict of kernel name to timings
+    """
+    # The kernels write to these files so they are put back afterwards
+    saved = {}
+    for path in ["data/maze.txt", PLAYER_DATA_PATH]:
+        with open(path) as f:
+            saved[path] = f.read()
+
+    pygame.init()
+    DataLoader.player_name = "alex"
+    _ = DataLoader()
+
+    results = {}
+    try:
+        for name, func in kernels():
+            if only is None or only in name:
+                results[name] = time_kernel(func, repeat)
+    finally:
+        for path, contents in saved.items():
+            with open(path, "w") as f:
+                f.write(contents)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Finds kernels which are slower than the baseline
+    :param results: Timings from run()
+    :param baseline: Timings saved from an earlier run()
+    :param threshold: Allowed slowdown as a fraction, e.g 0.1 for 10%
+    :return: List of dicts of name, baseline, current and change for each regression
+    """
+    regressions = []
+    for name, timing in results.items():
+        if name in baseline:
+            change = timing["median_us"] / baseline[name]["median_us"] - 1
+            if change > threshold:
+                regressions.append({"name": name, "baseline_us": baseline[name]["median_us"], "current_us": timing["median_us"], "change": change})
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the game's hot functions")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs of each kernel, the median is reported")
+    parser.add_argument("--only", help="Only run kernels whose name contains this")
+    parser.add_argument("--save", help="File to write the results to, for use as a baseline")
+    parser.add_argument("--compare", help="Baseline file to compare the results against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown allowed before a kernel counts as a regression")
+    args = parser.parse_args()
+
+    kernel_results = run(args.repeat, args.only)
+    output = {"kernels": kernel_results}
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline_results = json.load(f)["kernels"]
+        output["regressions"] = compare(kernel_results, baseline_results, args.threshold)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(output, f, indent=2)
+    print(json.dumps(output, indent=2))
+
+    if output.get("regressions"):
+        sys.exit(1)
@@ -1,4 +1,4 @@
-import random
+from rng import RNG
 from collections import ChainMap
 
 
@@ -54,8 +54,9 @@ class MazeCreator:
         puz_cur_pos = (1, 1)
         self.grid[puz_cur_pos[1]][puz_cur_pos[0]] = "X"
         walls = [*self.get_adjacent_walls(puz_cur_pos)]
+        maze_rng = RNG.stream("maze")
         while walls:
-            wall = random.choice(walls)
+            wall = maze_rng.choice(walls)
             # Vertical wall separating horizontal cells, checks if one isnt visited using xor
             if (self.grid[wall[1]][wall[0] - 1] == "O") ^ (self.grid[wall[1]][wall[0] + 1] == "O"):
                 if self.grid[wall[1]][wall[0] - 1] == "O":
@@ -2,7 +2,8 @@ import pygame
 import pygame.gfxdraw
 from math import sin, cos, atan2, degrees, radians
 import os
-from typing import Union, Iterable
+import numpy as np
+from typing import Union
 from random import randint
 from dataclasses import dataclass
 pygame.init()
@@ -42,20 +43,44 @@ class Wall:
     y2: Union[int, float]
 
 
-def line_collide(line_1_coords: Iterable, line_2_coords: Iterable) -> tuple:
-    # Unpacking argument iterable
-    x1, y1, x2, y2 = line_1_coords
-    x3, y3, x4, y4 = line_2_coords
+def line_collide_batch(lines_1, lines_2) -> tuple:
+    """
+    Line-Line Collision for many pairs of lines at once, see line_collide_batch in utils.py
+    :param lines_1: Array of (x1, y1, x2, y2) with shape (..., 4)
+    :param lines_2: Array of (x3, y3, x4, y4) with shape (..., 4)
+    :return: (hit, t, points), t and points are nan where there isn't a collision
+    """
+    lines_1 = np.asarray(lines_1, dtype=float)
+    lines_2 = np.asarray(lines_2, dtype=float)
+    p1, d1 = lines_1[..., :2], lines_1[..., 2:] - lines_1[..., :2]
+    p3, d2 = lines_2[..., :2], lines_2[..., 2:] - lines_2[..., :2]
+    r = p3 - p1
+
+    def cross(a, b):
+        return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+    def dot(a, b):
+        return a[..., 0] * b[..., 0] + a[..., 1] * b[..., 1]
+
+    denom = cross(d1, d2)
+    r_d1, r_d2 = cross(r, d1), cross(r, d2)
+    len_1, len_2 = dot(d1, d1), dot(d2, d2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = r_d2 / denom
+        u = r_d1 / denom
+        crossing = (denom != 0) & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
 
-    # Calculating t and u
-    t = ((((x1 - x3) * (y3 - y4)) - ((y1 - y3) * (x3 - x4))) / (((x1 - x2) * (y3 - y4)) - ((y1 - y2) * (x3 - x4))))
-    u = -((((x1 - x2) * (y1 - y3)) - ((y1 - y2) * (x1 - x3))) / (((x1 - x2) * (y3 - y4)) - ((y1 - y2) * (x3 - x4))))
+        t3 = dot(r, d1) / len_1
+        t4 = dot(r + d2, d1) / len_1
+        lo = np.maximum(np.minimum(t3, t4), 0)
+        overlapping = (denom == 0) & (len_1 > 0) & (r_d1 == 0) & (lo <= np.minimum(np.maximum(t3, t4), 1))
 
-    # Calculating intersection coords
-    px = x1 + (t * (x2 - x1))
-    py = y1 + (t * (y2 - y1))
+        s = -dot(r, d2) / len_2
+        on_line = (len_1 == 0) & np.where(len_2 > 0, (r_d2 == 0) & (s >= 0) & (s <= 1), (r == 0).all(axis=-1))
 
-    return (px, py) if 0.0 <= t <= 1.0 and 0.0 <= u <= 1.0 else False
+    t = np.where(crossing, t, np.where(overlapping, lo, np.where(on_line, 0.0, np.nan)))
+    return crossing | overlapping | on_line, t, p1 + t[..., None] * d1
 
 
 def colour_lerp(a: Union[tuple, list], b: Union[tuple, list], num_of_cols: int) -> tuple:
@@ -84,21 +109,21 @@ def set_rays(p: Player, rs: list, ws: list) -> list:
     for pos, ray in enumerate(rs):
         ray.x1 = p.x
         ray.y1 = p.y
-        fx = p.x + (ray.r * cos(radians(l + pos)))
-        fy = p.y - (ray.r * sin(radians(l + pos)))
-        ray.x2 = fx
-        ray.y2 = fy
-
-        # Check if ray collides with any wall
-        collide_points = []
-        for w in ws:
-            collide_coords = line_collide([ray.x1, ray.y1, fx, fy], [w.x1, w.y1, w.x2, w.y2])
-            if collide_coords:
-                collide_points.append(collide_coords)
-
-        # Get closest collision
-        if collide_points:
-            ray.x2, ray.y2 = min(collide_points, key=lambda a: abs(a[0]-ray.x1) + abs(a[1]-ray.y1))
+        ray.x2 = p.x + (ray.r * cos(radians(l + pos)))
+        ray.y2 = p.y - (ray.r * sin(radians(l + pos)))
+
+    # Check every ray against every wall at once
+    if rs and ws:
+        hit, t, points = line_collide_batch(
+            [[(ray.x1, ray.y1, ray.x2, ray.y2)] for ray in rs],
+            [[(w.x1, w.y1, w.x2, w.y2) for w in ws]]
+        )
+
+        # Get closest collision, the smallest t is the closest to the start of the ray
+        closest = np.argmin(np.where(hit, t, np.inf), axis=1)
+        for ray, ray_hit, ray_points, c in zip(rs, hit, points, closest):
+            if ray_hit[c]:
+                ray.x2, ray.y2 = ray_points[c]
 
     return rs
 
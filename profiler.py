@@ -0,0 +1,147 @@
+import numpy as np
+from time import perf_counter
+from collections import deque
+from contextlib import contextmanager
+from constants import PROFILER_PHASES, PROFILER_HISTORY
+
+
+class Profiler:
+    """
+    Times each phase of the game loop over the last PROFILER_HISTORY frames
+    The loop calls lap() after each phase, which gives that phase the time since the previous lap,
+    code deeper down such as pathfinding is timed with section() and taken out of the phase around it
+    """
+    enabled = True
+    __frame_start = None
+    __lap_start = None
+    __in_sections = 0
+    __current = {}
+    __history = {}
+
+    @staticmethod
+    def start_frame() -> None:
+        """
+        Starts timing a new frame
+        :return: None
+        """
+        if not Profiler.enabled:
+            return
+        Profiler.__frame_start = Profiler.__lap_start = perf_counter()
+        Profiler.__in_sections = 0
+        Profiler.__current = dict.fromkeys(PROFILER_PHASES, 0)
+
+    @staticmethod
+    def lap(phase: str) -> None:
+        """
+        Adds the time since the last lap to a phase
+        :param phase: Name from PROFILER_PHASES
+        :return: None
+        """
+        if not Profiler.enabled or Profiler.__lap_start is None:
+            return
+        now = perf_counter()
+        Profiler.__current[phase] += (now - Profiler.__lap_start) * 1000 - Profiler.__in_sections
+        Profiler.__lap_start = now
+        Profiler.__in_sections = 0
+
+    @staticmethod
+    @contextmanager
+    def section(phase: str):
+        """
+        Times a block inside another phase, e.g pathfinding inside the enemy update
+        :param phase: Name from PROFILER_PHASES
+        :return: Context manager
+        """
+        if not Profiler.enabled or Profiler.__lap_start is None:
+            yield
+            return
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (perf_counter() - start) * 1000
+            Profiler.__current[phase] += elapsed
+            Profiler.__in_sections += elapsed
+
+    @staticmethod
+    def end_frame() -> None:
+        """
+        Stores the timings of the frame, anything not given to a phase is counted as 'other'
+        :return: None
+        """
+        if not Profiler.enabled or Profiler.__frame_start is None:
+            return
+        total = (perf_counter() - Profiler.__frame_start) * 1000
+        Profiler.__current["other"] = max(total - sum(Profiler.__current.values()), 0)
+        Profiler.__current["frame"] = total
+        for phase, ms in Profiler.__current.items():
+            if phase not in Profiler.__history:
+                Profiler.__history[phase] = deque(maxlen=PROFILER_HISTORY)
+            Profiler.__history[phase].append(ms)
+        Profiler.__frame_start = Profiler.__lap_start = None
+
+    @staticmethod
+    def phases() -> list:
+        """
+        Gets every phase which has been recorded
+        :return: Phase names in loop order followed by 'other' and 'frame'
+        """
+        return [p for p in [*PROFILER_PHASES, "other", "frame"] if p in Profiler.__history]
+
+    @staticmethod
+    def frames() -> int:
+        """
+        :return: Number of frames currently in the history
+        """
+        return len(Profiler.__history.get("frame", ()))
+
+    @staticmethod
+    def percentiles(phase: str, q: tuple=(50, 95, 99)) -> tuple:
+        """
+        Gets percentiles of a phase's time over the history
+        :param phase: Phase name
+        :param q: Percentiles to get
+        :return: Milliseconds for each percentile
+        """
+        times = Profiler.__history.get(phase)
+        if not times:
+            return tuple(0.0 for _ in q)
+        return tuple(np.percentile(np.fromiter(times, float), q).tolist())
+
+    @staticmethod
+    def histogram(phase: str="frame", bins: int=20, limit: float=None) -> tuple:
+        """
+        Counts how many frames fell into each range of times
+        :param phase: Phase name
+        :param bins: Number of ranges
+        :param limit: Largest time in milliseconds, slower frames go in the last bin, defaults to the slowest frame
+        :return: (counts, bin edges)
+        """
+        times = np.fromiter(Profiler.__history.get(phase, ()), float)
+        if limit is None:
+            limit = times.max() if len(times) else 1.0
+        counts, edges = np.histogram(np.minimum(times, limit), bins=bins, range=(0, max(limit, 1e-3)))
+        return counts.tolist(), edges.tolist()
+
+    @staticmethod
+    def summary() -> dict:
+        """
+        Gets the mean and percentiles of every phase
+        :return: Dict of phase name to dict of mean, p50, p95, p99 and max in milliseconds
+        """
+        summary = {}
+        for phase in Profiler.phases():
+            times = np.fromiter(Profiler.__history[phase], float)
+            p50, p95, p99 = np.percentile(times, (50, 95, 99)).tolist()
+            summary[phase] = {"mean": float(times.mean()), "p50": p50, "p95": p95, "p99": p99, "max": float(times.max())}
+        return summary
+
+    @staticmethod
+    def reset(history: int=PROFILER_HISTORY) -> None:
+        """
+        Removes all recorded timings
+        :param history: Number of frames to keep from now on
+        :return: None
+        """
+        Profiler.__history = {p: deque(maxlen=history) for p in [*PROFILER_PHASES, "other", "frame"]}
+        Profiler.__frame_start = Profiler.__lap_start = None
@@ -0,0 +1,133 @@
+import pygame
+import numpy as np
+from constants import MAX_BULLET_SPEED, PROJECTILE_CAPACITY
+
+
+class Projectiles:
+    """
+    Every live projectile stored as arrays, one row per projectile, so they are all moved, expired and removed
+    together each frame instead of one Python object at a time
+    """
+    PLAYER = 0
+    ENEMY = 1
+
+    def __init__(self, capacity: int=PROJECTILE_CAPACITY):
+        self.__count = 0
+        self.__last_dt = 0
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.origin = np.zeros((capacity, 2))
+        self.range_sq = np.zeros(capacity)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.damage = np.zeros(capacity, dtype=np.int32)
+        self.colour = np.zeros((capacity, 3), dtype=np.uint8)
+        self.owner = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return self.__count
+
+    def __arrays(self) -> list:
+        return [self.pos, self.vel, self.origin, self.range_sq, self.size, self.damage, self.colour, self.owner, self.alive]
+
+    def __grow(self) -> None:
+        """
+        Doubles the capacity of every array
+        :return: None
+        """
+        self.pos, self.vel, self.origin, self.range_sq, self.size, self.damage, self.colour, self.owner, self.alive = [
+            np.concatenate((arr, np.zeros_like(arr))) for arr in self.__arrays()
+        ]
+
+    def spawn(self, origin_x: float, origin_y: float, target_x: float, target_y: float, weapon: dict) -> None:
+        """
+        Adds a projectile which travels from the origin towards the target until it is proj_dist away from the origin
+        :param origin_x: Start x coord in board coordinates
+        :param origin_y: Start y coord in board coordinates
+        :param target_x: Target x coord in board coordinates
+        :param target_y: Target y coord in board coordinates
+        :param weapon: Item data of the weapon which fired it
+        :return: None
+        """
+        # A projectile aimed at its own origin has no direction to travel in
+        direction = np.array((target_x - origin_x, target_y - origin_y), dtype=float)
+        dist = np.hypot(*direction)
+        if dist == 0:
+            return
+
+        if self.__count == len(self.alive):
+            self.__grow()
+
+        # Unit direction to the target scaled by the weapons speed as a percentage of the max speed
+        speed = MAX_BULLET_SPEED * (weapon["proj_speed"] / 100)
+
+        i = self.__count
+        self.pos[i] = self.origin[i] = (origin_x, origin_y)
+        self.vel[i] = direction * (speed / dist)
+        self.range_sq[i] = weapon["proj_dist"] ** 2
+        self.size[i] = weapon["proj_size"]
+        self.damage[i] = weapon["damage"]
+        self.colour[i] = weapon["colour"]
+        self.owner[i] = Projectiles.ENEMY if weapon["item_type"] == "enemy_weapon" else Projectiles.PLAYER
+        self.alive[i] = True
+        self.__count += 1
+
+    def kill(self, index: int) -> None:
+        """
+        Marks a projectile to be removed on the next update
+        :param index: Row of the projectile
+        :return: None
+        """
+        self.alive[index] = False
+
+    def update(self, dt: float) -> None:
+        """
+        Moves every projectile by its velocity scaled by delta time, then removes those which were killed
+        or have left the circle (x - origin_x)^2 + (y - origin_y)^2 < range^2
+        :param dt: Delta time
+        :return: None
+        """
+        n = self.__count
+        self.__last_dt = dt
+        self.pos[:n] += self.vel[:n] * dt
+        self.alive[:n] &= ((self.pos[:n] - self.origin[:n]) ** 2).sum(axis=1) < self.range_sq[:n]
+
+        # Move the remaining projectiles to the front of the arrays
+        keep = self.alive[:n]
+        count = int(keep.sum())
+        if count != n:
+            for arr in self.__arrays():
+                arr[:count] = arr[:n][keep]
+            self.alive[count:n] = False
+            self.__count = count
+
+    def rects(self, dt: float=0):
+        """
+        Gets the rect, owner and damage of every projectile and how far it moves in the next update
+        :param dt: Delta time the next update will be given
+        :return: Iterator of (row, pygame.Rect in board coordinates, owner, damage, dx, dy)
+        """
+        n = self.__count
+        for i, (x, y), (dx, dy), size, owner, damage in zip(
+            range(n), self.pos[:n].astype(int).tolist(), (self.vel[:n] * dt).tolist(), self.size[:n].tolist(), self.owner[:n].tolist(), self.damage[:n].tolist()
+        ):
+            yield i, pygame.Rect(x, y, size, size), owner, damage, dx, dy
+
+    def get_visible(self, view: pygame.Rect, alpha: float=1.0) -> list:
+        """
+        Gets the projectiles which overlap the view
+        :param view: Rect in board coordinates
+        :param alpha: How far between the previous update and the last one to draw them, 1 is where they are now
+        :return: List of (pygame.Rect, colour) in board coordinates
+        """
+        n = self.__count
+        # Velocity doesn't change so the previous position is one update's movement back
+        pos, size = self.pos[:n] - self.vel[:n] * (self.__last_dt * (1 - alpha)), self.size[:n]
+        visible = np.flatnonzero(
+            (pos[:, 0] + size > view.left) & (pos[:, 0] < view.right) &
+            (pos[:, 1] + size > view.top) & (pos[:, 1] < view.bottom)
+        )
+        return [
+            (pygame.Rect(x, y, s, s), tuple(c))
+            for (x, y), s, c in zip(pos[visible].astype(int).tolist(), size[visible].tolist(), self.colour[visible].tolist())
+        ]
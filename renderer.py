@@ -0,0 +1,322 @@
+import pygame
+from collections import OrderedDict
+from operator import itemgetter
+from constants import TEXT_CACHE_SIZE, ROTATION_STEPS, ITEM_DROP_FRAME_TIME
+from asset_manager import AssetManager
+
+
+class DirtyRects:
+    """Collects the areas of the display which changed during a frame so only they are pushed to the screen"""
+    def __init__(self, screen_rect: pygame.Rect):
+        self.__screen_rect = pygame.Rect(screen_rect)
+        self.__rects = []
+        self.__layers = {}
+        self.__drawn = set()
+        self.__transient = []
+        self.__next_transient = []
+        self.__full = True
+
+    def add(self, rect: pygame.Rect) -> None:
+        """
+        Marks an area of the display as changed
+        :param rect: Area in window coordinates
+        :return: None
+        """
+        rect = pygame.Rect(rect).clip(self.__screen_rect)
+        if rect.w and rect.h:
+            self.__rects.append(rect)
+
+    def extend(self, rects: list) -> None:
+        """
+        Marks multiple areas of the display as changed
+        :param rects: List of areas in window coordinates
+        :return: None
+        """
+        for rect in rects:
+            self.add(rect)
+
+    def track(self, key, rect: pygame.Rect, changed: bool=True) -> None:
+        """
+        Reports a layer drawn to the display this frame, e.g an entity or a panel
+        If the layer moved then the area it covered last frame is also marked so what is under it is shown again
+        :param key: Anything hashable which identifies the layer
+        :param rect: Area the layer was drawn to, e.g the rect returned by display.blit
+        :param changed: False if the layer looks the same as it did last frame
+        :return: None
+        """
+        rect = pygame.Rect(rect)
+        prev = self.__layers.get(key)
+        if prev != rect:
+            self.add(rect)
+            if prev is not None:
+                self.add(prev)
+        elif changed:
+            self.add(rect)
+        self.__layers[key] = rect
+        self.__drawn.add(key)
+
+    def add_transient(self, rect: pygame.Rect) -> None:
+        """
+        Marks an area drawn this frame by something which isn't tracked, e.g a bullet
+        The area is marked again next frame so it is cleared if nothing is drawn there
+        :param rect: Area in window coordinates
+        :return: None
+        """
+        self.add(rect)
+        self.__next_transient.append(rect)
+
+    def invalidate_all(self) -> None:
+        """
+        Makes the next update push the whole display, used when the camera scrolls
+        :return: None
+        """
+        self.__full = True
+
+    def update(self) -> None:
+        """
+        Pushes the changed areas to the screen and starts the next frame
+        :return: None
+        """
+        # Layers which weren't drawn this frame leave behind the area they used to cover
+        for key in [k for k in self.__layers if k not in self.__drawn]:
+            self.add(self.__layers.pop(key))
+        self.extend(self.__transient)
+
+        if self.__full:
+            pygame.display.update()
+        elif self.__rects:
+            pygame.display.update(self.__rects)
+
+        self.__rects = []
+        self.__drawn = set()
+        self.__transient = self.__next_transient
+        self.__next_transient = []
+        self.__full = False
+
+
+class RenderQueue:
+    """Collects draw commands from every part of the game and draws them in layer order with one Surface.blits call"""
+    def __init__(self):
+        self.__commands = []
+        self.__shapes = {}
+
+    def blit(self, layer: int, source: pygame.Surface, dest: tuple, area: pygame.Rect=None, key=None, changed: bool=True) -> None:
+        """
+        Queues a surface to be drawn
+        :param layer: Layer to draw on, commands on the same layer are drawn in the order they were queued
+        :param source: Surface to draw, it is read when the queue is drawn so it must not change before then
+        :param dest: (x, y) in window coordinates
+        :param area: Part of the source to draw, None draws all of it
+        :param key: Identifies the layer for DirtyRects.track, if None the area is marked as transient
+        :param changed: False if the surface looks the same as it did last frame
+        :return: None
+        """
+        self.__commands.append((layer, source, dest, area, key, changed))
+
+    def fill(self, layer: int, colour: tuple, rect: pygame.Rect) -> None:
+        """
+        Queues a filled rect, drawn by blitting a cached solid surface so it is part of the same blits call
+        :param layer: Layer to draw on
+        :param colour: Colour of the rect
+        :param rect: Rect in window coordinates
+        :return: None
+        """
+        rect = pygame.Rect(rect)
+        key = ("rect", tuple(colour), rect.size)
+        if key not in self.__shapes:
+            self.__shapes[key] = pygame.Surface(rect.size)
+            self.__shapes[key].fill(colour)
+        self.blit(layer, self.__shapes[key], rect.topleft)
+
+    def circle(self, layer: int, colour: tuple, center: tuple, radius: int) -> None:
+        """
+        Queues a filled circle, drawn by blitting a cached circle surface
+        :param layer: Layer to draw on
+        :param colour: Colour of the circle
+        :param center: (x, y) of the center in window coordinates
+        :param radius: Radius of the circle
+        :return: None
+        """
+        key = ("circle", tuple(colour), radius)
+        if key not in self.__shapes:
+            self.__shapes[key] = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(self.__shapes[key], colour, (radius, radius), radius)
+        self.blit(layer, self.__shapes[key], (center[0] - radius, center[1] - radius))
+
+    def draw(self, surface: pygame.Surface, dirty_rects: DirtyRects=None) -> None:
+        """
+        Draws every queued command sorted by layer and empties the queue
+        :param surface: Surface to draw to, usually the display
+        :param dirty_rects: Tracker to report the drawn areas to
+        :return: None
+        """
+        # sorted() is stable so commands on the same layer keep their order
+        commands = sorted(self.__commands, key=itemgetter(0))
+        self.__commands = []
+        rects = surface.blits([(source, dest, area) for _, source, dest, area, _, _ in commands])
+
+        if dirty_rects is not None:
+            for command, rect in zip(commands, rects):
+                key, changed = command[4], command[5]
+                if key is None:
+                    dirty_rects.add_transient(rect)
+                else:
+                    dirty_rects.track(key, rect, changed)
+
+
+class TextCache:
+    """Shared cache of rendered text so strings which repeat every frame are only rendered once"""
+    max_size = TEXT_CACHE_SIZE
+    __surfaces = OrderedDict()
+    __glyphs = OrderedDict()
+
+    @staticmethod
+    def __get(cache: OrderedDict, font: pygame.font.Font, text: str, antialias: bool, colour: tuple) -> pygame.Surface:
+        """
+        Gets rendered text from a cache, rendering it and evicting the least recently used text if needed
+        The underline style is part of the key because Inspector toggles it on the shared font
+        :param cache: Cache to look in
+        :param font: Font to render the text with
+        :param text: Text to render
+        :param antialias: Whether the text has smooth edges
+        :param colour: Colour of the text
+        :return: The rendered text
+        """
+        key = (font, font.get_underline(), text, antialias, tuple(colour))
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        surface = font.render(text, antialias, colour)
+        cache[key] = surface
+        if len(cache) > TextCache.max_size:
+            cache.popitem(last=False)
+        return surface
+
+    @staticmethod
+    def render(font: pygame.font.Font, text: str, antialias: bool, colour: tuple) -> pygame.Surface:
+        """
+        Cached version of font.render, the returned surface is shared so it must not be drawn on
+        :param font: Font to render the text with
+        :param text: Text to render
+        :param antialias: Whether the text has smooth edges
+        :param colour: Colour of the text
+        :return: The rendered text
+        """
+        return TextCache.__get(TextCache.__surfaces, font, text, antialias, colour)
+
+    @staticmethod
+    def render_glyphs(font: pygame.font.Font, text: str, antialias: bool, colour: tuple) -> pygame.Surface:
+        """
+        Builds the text from cached single character surfaces
+        Used for numbers which change often, e.g the fps counter, so each new value isn't kept in the cache
+        :param font: Font to render the text with
+        :param text: Text to render
+        :param antialias: Whether the text has smooth edges
+        :param colour: Colour of the text
+        :return: The rendered text
+        """
+        glyphs = [TextCache.__get(TextCache.__glyphs, font, char, antialias, colour) for char in text]
+        surface = pygame.Surface((sum(g.get_width() for g in glyphs), font.get_height()), pygame.SRCALPHA)
+
+        # Glyphs don't overlap so taking the max copies them onto the empty surface without blending the edges
+        x = 0
+        for glyph in glyphs:
+            surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += glyph.get_width()
+        return surface
+
+
+class RotationCache:
+    """An image pre-rotated to a fixed number of angles so facing a direction is a lookup instead of a transform"""
+    __loaded = {}
+
+    def __init__(self, image: pygame.Surface, steps: int=ROTATION_STEPS):
+        self.__steps = steps
+        self.__frames = [pygame.transform.rotate(image, (360 / steps) * i) for i in range(steps)]
+
+    @classmethod
+    def load(cls, name: str, steps: int=ROTATION_STEPS):
+        """
+        Rotates an image once, later calls with the same name and steps share the same frames
+        :param name: Asset name of the image, e.g 'player'
+        :param steps: Number of angles, more steps gives smoother rotation but uses more memory
+        :return: RotationCache of the image
+        """
+        key = (name, steps)
+        if key not in cls.__loaded:
+            cls.__loaded[key] = cls(AssetManager.get(name), steps)
+        return cls.__loaded[key]
+
+    @property
+    def steps(self):
+        return self.__steps
+
+    def get(self, degrees: float) -> pygame.Surface:
+        """
+        Gets the frame closest to the angle
+        :param degrees: Angle anticlockwise, the same as pygame.transform.rotate
+        :return: The rotated image
+        """
+        return self.__frames[round(degrees * self.__steps / 360) % self.__steps]
+
+
+class AnimationClip:
+    """A sequence of frames packed into one sprite sheet, drawn by index so every user shares the same frames"""
+    __loaded = {}
+
+    def __init__(self, frames: list, frame_time: int):
+        self.__frame_time = frame_time
+        self.__frame_width = max(f.get_width() for f in frames)
+        self.__frame_height = max(f.get_height() for f in frames)
+
+        # Frames are packed left to right so the whole clip is a single surface in memory
+        self.__sheet = pygame.Surface((self.__frame_width * len(frames), self.__frame_height), pygame.SRCALPHA)
+        self.__sheet.blits([(frame, (i * self.__frame_width, 0)) for i, frame in enumerate(frames)], False)
+        if pygame.display.get_surface() is not None:
+            self.__sheet = self.__sheet.convert_alpha()
+        self.__frames = [
+            self.__sheet.subsurface((i * self.__frame_width, 0, self.__frame_width, self.__frame_height))
+            for i in range(len(frames))
+        ]
+
+    @classmethod
+    def load(cls, name: str, frame_count: int, frame_time: int=ITEM_DROP_FRAME_TIME):
+        """
+        Loads the frames '{name}_1' to '{name}_{frame_count}' once, later calls with the same name share the clip
+        :param name: Asset name prefix of the frames, e.g 'gold'
+        :param frame_count: Number of frames in the animation
+        :param frame_time: Milliseconds each frame is shown for
+        :return: AnimationClip of the frames
+        """
+        key = (name, frame_count, frame_time)
+        if key not in cls.__loaded:
+            frames = [AssetManager.get(f"{name}_{i}") for i in range(1, frame_count + 1)]
+            cls.__loaded[key] = cls(frames, frame_time)
+            # The sheet holds its own copy so the separate frames don't need to stay loaded
+            for i in range(1, frame_count + 1):
+                AssetManager.discard(f"{name}_{i}")
+        return cls.__loaded[key]
+
+    def __len__(self):
+        return len(self.__frames)
+
+    @property
+    def duration(self):
+        return self.__frame_time * len(self.__frames)
+
+    def frame_index(self, elapsed: float) -> int:
+        """
+        Gets which frame is showing after some time, the index is past the last frame once the clip has finished
+        :param elapsed: Milliseconds since the clip started
+        :return: Frame index
+        """
+        return int(max(0, elapsed) // self.__frame_time)
+
+    def get(self, index: int) -> pygame.Surface:
+        """
+        Gets a frame of the clip, the surface is shared so it must not be drawn on
+        :param index: Frame index
+        :return: Frame surface
+        """
+        return self.__frames[index]
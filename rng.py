@@ -0,0 +1,35 @@
+import random
+from secrets import randbits
+from constants import RNG_STREAMS
+
+
+class RNG:
+    """
+    Gives each subsystem its own random number stream, all made from one seed
+    The streams are independent so e.g an extra loot roll doesn't change where the next maze's doors go,
+    seeding with the same number makes the maze, doors, enemy placement, enemy AI and loot repeat exactly
+    """
+    seed_value = None
+    __streams = {}
+
+    @staticmethod
+    def seed(seed: int=None) -> None:
+        """
+        Restarts every stream from a seed
+        :param seed: Seed for all the streams, a random one is picked and stored in seed_value if None
+        :return: None
+        """
+        RNG.seed_value = randbits(64) if seed is None else seed
+        # String seeds are hashed with SHA-512 so the streams don't depend on PYTHONHASHSEED
+        RNG.__streams = {name: random.Random(f"{RNG.seed_value}:{name}") for name in RNG_STREAMS}
+
+    @staticmethod
+    def stream(name: str) -> random.Random:
+        """
+        Gets the stream for a subsystem, the streams are seeded randomly if seed() hasn't been called
+        :param name: Name from RNG_STREAMS
+        :return: The stream
+        """
+        if not RNG.__streams:
+            RNG.seed()
+        return RNG.__streams[name]
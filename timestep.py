@@ -0,0 +1,64 @@
+from constants import SIMULATION_RATE, MAX_SIMULATION_STEPS
+
+
+class FixedTimestep:
+    """Splits real time into simulation steps of a fixed length so game speed doesn't depend on the frame rate"""
+    def __init__(self, rate: int=SIMULATION_RATE, max_steps: int=MAX_SIMULATION_STEPS):
+        self.__step_ms = 1000 / rate
+        self.__max_steps = max_steps
+        self.__accumulator = 0
+        self.dropped_steps = 0
+
+    @property
+    def step_ms(self):
+        return self.__step_ms
+
+    @property
+    def alpha(self) -> float:
+        """
+        How far real time is between the last simulation step and the next one
+        :return: Fraction in [0, 1), used to interpolate drawn positions
+        """
+        return self.__accumulator / self.__step_ms
+
+    def advance(self, ms: float) -> int:
+        """
+        Adds the time since the last frame and takes as many whole steps as fit
+        If the game has fallen too far behind the extra steps are dropped, this slows the game down
+        for a moment instead of running more and more steps to catch up
+        :param ms: Milliseconds since the last frame
+        :return: Number of simulation steps to run this frame
+        """
+        self.__accumulator += ms
+        steps = int(self.__accumulator // self.__step_ms)
+        if steps > self.__max_steps:
+            self.dropped_steps += steps - self.__max_steps
+            steps = self.__max_steps
+            self.__accumulator = 0
+        else:
+            self.__accumulator -= steps * self.__step_ms
+        return steps
+
+
+class Interpolator:
+    """Remembers where objects were before the last simulation step so they can be drawn part way between steps"""
+    def __init__(self):
+        self.__previous = {}
+
+    def snapshot(self, objects) -> None:
+        """
+        Stores the current positions, called at the start of each simulation step
+        :param objects: Anything with x and y attributes
+        :return: None
+        """
+        self.__previous = {obj: (obj.x, obj.y) for obj in objects}
+
+    def get(self, obj, alpha: float) -> tuple:
+        """
+        Gets the position to draw an object at, objects created during the last step are drawn where they are
+        :param obj: Object with x and y attributes
+        :param alpha: FixedTimestep.alpha
+        :return: Interpolated (x, y)
+        """
+        px, py = self.__previous.get(obj, (obj.x, obj.y))
+        return px + (obj.x - px) * alpha, py + (obj.y - py) * alpha
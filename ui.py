@@ -3,6 +3,9 @@ from data_loader import DataLoader
 from itertools import chain
 from constants import *
 from xml.etree.ElementTree import Element
+from renderer import TextCache
+from asset_manager import AssetManager
+from profiler import Profiler
 
 
 class Hotbar(pygame.Surface):
@@ -14,6 +17,7 @@ class Hotbar(pygame.Surface):
         self.inv_size = 5
         self.__items = self.__get_items()
         self.__selected_pos = 0
+        self.__drawn_state = None
         space_in = 9
         self.__item_spaces = [
             pygame.Rect(
@@ -27,6 +31,7 @@ class Hotbar(pygame.Surface):
     def __setitem__(self, key, value):
         if key < len(self.__items):
             self.__items[key] = value
+            self.__drawn_state = None
 
     def __getitem__(self, item):
         """
@@ -58,23 +63,29 @@ class Hotbar(pygame.Surface):
         :return: list of all items and their images, e.g (fire.png, fire)
         """
         return list(map(
-            lambda x: (pygame.image.load(f"{MAIN_ASSET_PATH}{x}.png"), x),
+            lambda x: (AssetManager.get(x), x),
             [
                 "no_item" if DataLoader.player_data["hotbar"][i] is None else DataLoader.player_data["hotbar"][i]
                 for i in range(self.inv_size)
             ]
         ))
 
-    def update(self) -> None:
+    def update(self) -> bool:
         """
-        Update the hotbar
-        :return: None
+        Update the hotbar, the surface is only redrawn if the hotbar items or selected position changed
+        :return: True if the surface was redrawn
         """
+        state = (tuple(DataLoader.player_data["hotbar"][:self.inv_size]), self.__selected_pos)
+        if state == self.__drawn_state:
+            return False
+
         # Fill create background colour
         self.fill(HOTBAR_BACKGROUND)
 
-        # Get current items
-        self.__items = self.__get_items()
+        # Get current items, images are only loaded again if the items changed
+        if self.__drawn_state is None or state[0] != self.__drawn_state[0]:
+            self.__items = self.__get_items()
+        self.__drawn_state = state
 
         # Loop through spaces to draw
         for pos, space in enumerate(self.__item_spaces):
@@ -88,6 +99,8 @@ class Hotbar(pygame.Surface):
             if self.__items[pos] is not None:
                 self.blit(self.__items[pos][0], ((space.x + (space.w // 2)) - (self.__items[pos][0].get_width() // 2), (space.y + (space.h // 2)) - (self.__items[pos][0].get_height() // 2)))
 
+        return True
+
     def change_selected(self, amount: int) -> None:
         """
         Changes the selected position on the hotbar
@@ -154,7 +167,7 @@ class Inventory(pygame.Surface):
         :return: list of all items and their images, e.g (fire.png, fire)
         """
         return list(map(
-            lambda x: (pygame.image.load(f"{MAIN_ASSET_PATH}{x}.png"), x),
+            lambda x: (AssetManager.get(x), x),
             [
                 "no_item" if DataLoader.player_data["inventory"][i] is None else DataLoader.player_data["inventory"][i]
                 for i in range(self.inv_size)
@@ -234,13 +247,13 @@ class Inspector(pygame.Surface):
 
             # Draw name with underline
             font.set_underline(True)
-            self.blit(font.render(name, True, TEXT_COLOUR), (self.__width // 2 - (font.size(name)[0] // 2), 90))
+            self.blit(TextCache.render(font, name, True, TEXT_COLOUR), (self.__width // 2 - (font.size(name)[0] // 2), 90))
             font.set_underline(False)
 
             # If there is data provided, loop through and draw it
             self.blit(data["img"], (self.__width // 2 - (data["img"].get_width() // 2), 10))
             for pos, k in enumerate(data["attr"]):
-                self.blit(font.render(f"{k}: {data['attr'][k]}", True, TEXT_COLOUR), (10, 110 + (20 * pos)))
+                self.blit(TextCache.render(font, f"{k}: {data['attr'][k]}", True, TEXT_COLOUR), (10, 110 + (20 * pos)))
 
 
 class Equipment(pygame.Surface):
@@ -271,7 +284,7 @@ class Equipment(pygame.Surface):
         :return: List of loaded images
         """
         return [
-            pygame.image.load(f"{MAIN_ASSET_PATH}{DataLoader.player_data['armor'][i]}.png")
+            AssetManager.get(DataLoader.player_data["armor"][i])
             for i in ["head", "chest", "legs", "feet"]
         ]
 
@@ -305,12 +318,12 @@ class Equipment(pygame.Surface):
 
         # Draw the defense text
         self.blit(
-            font.render(defense, True, TEXT_COLOUR),
+            TextCache.render(font, defense, True, TEXT_COLOUR),
             (5, self.__height - font.size(defense)[1])
         )
         # Draw the coins text
         self.blit(
-            font.render(coins, True, COIN_TEXT_COLOUR),
+            TextCache.render(font, coins, True, COIN_TEXT_COLOUR),
             (self.__width - font.size(coins)[0] - 5, self.__height - font.size(defense)[1])
         )
         # Have to use pos like this as you cant enumerate the loop
@@ -333,6 +346,7 @@ class HealthBar(pygame.Surface):
         self.__width = WINDOW_WIDTH // 5
         self.__height = WINDOW_HEIGHT // 20
         self.__max_health = max_health
+        self.__drawn_state = None
 
     @property
     def width(self):
@@ -342,13 +356,17 @@ class HealthBar(pygame.Surface):
     def height(self):
         return self.__height
 
-    def update(self, font: pygame.font, player_health: int) -> None:
+    def update(self, font: pygame.font, player_health: int) -> bool:
         """
-        Updates health bar surface
+        Updates health bar surface, the surface is only redrawn if the health changed
         :param font: Font to be used to render the text
         :param player_health: Amount of health the player has
-        :return: None
+        :return: True if the surface was redrawn
         """
+        if (font, player_health) == self.__drawn_state:
+            return False
+        self.__drawn_state = (font, player_health)
+
         self.fill((0, 0, 0, 0))
 
         # Amount of health left
@@ -359,7 +377,8 @@ class HealthBar(pygame.Surface):
 
         # Main bar that shows amount
         pygame.draw.rect(self, HEALTHBAR_BACKGROUND_COLOUR, pygame.Rect(0, 0, (self.__width - font.size(health_txt)[0]) * (player_health / self.__max_health), self.__height))
-        self.blit(font.render(health_txt, True, HEALTHBAR_TEXT_COLOUR), (self.__width - font.size(health_txt)[0], self.__height // 4))
+        self.blit(TextCache.render_glyphs(font, health_txt, True, HEALTHBAR_TEXT_COLOUR), (self.__width - font.size(health_txt)[0], self.__height // 4))
+        return True
 
 
 class ManaBar(pygame.Surface):
@@ -369,6 +388,7 @@ class ManaBar(pygame.Surface):
         self.__width = WINDOW_WIDTH // 5
         self.__height = WINDOW_HEIGHT // 20
         self.__max_mana = max_mana
+        self.__drawn_state = None
 
     @property
     def width(self):
@@ -378,13 +398,17 @@ class ManaBar(pygame.Surface):
     def height(self):
         return self.__height
 
-    def update(self, font: pygame.font, player_mana: int) -> None:
+    def update(self, font: pygame.font, player_mana: int) -> bool:
         """
-        Updates mana bar surface
+        Updates mana bar surface, the surface is only redrawn if the mana changed
         :param font: Font to be used to render the text
         :param player_mana: The amount of mana the player has
-        :return: None
+        :return: True if the surface was redrawn
         """
+        if (font, player_mana) == self.__drawn_state:
+            return False
+        self.__drawn_state = (font, player_mana)
+
         self.fill((0, 0, 0, 0))
 
         # Amount of mana left
@@ -395,7 +419,8 @@ class ManaBar(pygame.Surface):
 
         # Main bar that shows amount
         pygame.draw.rect(self, MANABAR_BACKGROUND_COLOUR, pygame.Rect(font.size(health_txt)[0], 0, (self.__width - font.size(health_txt)[0]) * (player_mana / self.__max_mana), self.__height))
-        self.blit(font.render(health_txt, True, MANABAR_TEXT_COLOUR), (0, self.__height // 4))
+        self.blit(TextCache.render_glyphs(font, health_txt, True, MANABAR_TEXT_COLOUR), (0, self.__height // 4))
+        return True
 
 
 class Attributes(pygame.Surface):
@@ -404,8 +429,8 @@ class Attributes(pygame.Surface):
         super().__init__((WINDOW_WIDTH // 5, WINDOW_HEIGHT // 1.5), pygame.SRCALPHA)
         self.__width = WINDOW_WIDTH // 5
         self.__height = WINDOW_HEIGHT // 1.5
-        self.__plus_img = pygame.image.load(f"{MAIN_ASSET_PATH}plus.png")
-        self.__minus_img = pygame.image.load(f"{MAIN_ASSET_PATH}minus.png")
+        self.__plus_img = AssetManager.get("plus")
+        self.__minus_img = AssetManager.get("minus")
         self.__attr_data = DataLoader.player_data["attributes"]
         self.__button_size = int((WINDOW_HEIGHT / 720) * 25)
         self.__pluses = [pygame.Rect((self.__width // 2) + (self.__width // 8) + 10, (self.__height // 5) * (i + 1), self.__button_size, self.__button_size) for i in range(len(self.__attr_data))]
@@ -445,17 +470,17 @@ class Attributes(pygame.Surface):
 
             # Draw attr names and attr number text
             self.blit(
-                font.render(key, True, TEXT_COLOUR),
+                TextCache.render(font, key, True, TEXT_COLOUR),
                 (((self.__width // 8) + (self.__width // 4)) - (font.size(key)[0] // 2), ((self.__height // 5) * (pos + 1)) - font.size(key)[1])
             )
             self.blit(
-                font.render(str(self.__attr_data[key]), True, TEXT_COLOUR),
+                TextCache.render(font, str(self.__attr_data[key]), True, TEXT_COLOUR),
                 (((self.__width // 8) + (self.__width // 4)) - (font.size(str(self.__attr_data[key]))[0] // 2), ((self.__height // 5) * (pos + 1)) + font.size(str(self.__attr_data[key]))[1])
             )
 
             # Draw remaining skill point indicator
             pygame.draw.rect(self, ATTRIBURES_SP_BORDER, pygame.Rect(self.__width // 5, self.__height - 30, (self.__width // 5) * 3, 25))
-            self.blit(font.render(f"Unused SP: {DataLoader.player_data['unused_sp']}", True, TEXT_COLOUR), (self.__width // 5, self.__height - 25))
+            self.blit(TextCache.render(font, f"Unused SP: {DataLoader.player_data['unused_sp']}", True, TEXT_COLOUR), (self.__width // 5, self.__height - 25))
 
 
 class Tab(pygame.Surface):
@@ -492,11 +517,11 @@ class Tab(pygame.Surface):
 
         # Draw text
         self.blit(
-            font.render("Equipment", True, TAB_SELECTED_TEXT_COLOUR if self.selected_equipment else TEXT_COLOUR),
+            TextCache.render(font, "Equipment", True, TAB_SELECTED_TEXT_COLOUR if self.selected_equipment else TEXT_COLOUR),
             ((self.__sects[0].w // 2) - (font.size("Equipment")[0] // 2), (self.__sects[0].y + (self.__sects[0].h // 2)) - (font.size("Equipment")[1] // 2))
         )
         self.blit(
-            font.render("Attributes", True, TAB_SELECTED_TEXT_COLOUR if not self.selected_equipment else TEXT_COLOUR),
+            TextCache.render(font, "Attributes", True, TAB_SELECTED_TEXT_COLOUR if not self.selected_equipment else TEXT_COLOUR),
             (self.__sects[1].x + ((self.__sects[1].w // 2) - (font.size("Attributes")[0] // 2)), (self.__sects[1].y + (self.__sects[1].h // 2)) - (font.size("Equipment")[1] // 2))
         )
 
@@ -507,6 +532,7 @@ class XPBar(pygame.Surface):
         super().__init__((WINDOW_WIDTH // 2, WINDOW_HEIGHT // 20), pygame.SRCALPHA)
         self.__width = WINDOW_WIDTH // 2
         self.__height = WINDOW_HEIGHT // 20
+        self.__drawn_state = None
 
     @property
     def width(self):
@@ -516,16 +542,19 @@ class XPBar(pygame.Surface):
     def height(self):
         return self.__height
 
-    def update(self, font: pygame.font) -> None:
+    def update(self, font: pygame.font) -> bool:
         """
-        Updates the XPBar surface
+        Updates the XPBar surface, the surface is only redrawn if the XP or level changed
         :param font: Font to be used to render the text
-        :return: None
+        :return: True if the surface was redrawn
         """
-        self.fill(XPBAR_BACKGROUND)
-
         # Get current XP and player level
         xp, lvl = DataLoader.player_data["xp"], DataLoader.player_data["level"]
+        if (font, xp, lvl) == self.__drawn_state:
+            return False
+        self.__drawn_state = (font, xp, lvl)
+
+        self.fill(XPBAR_BACKGROUND)
 
         # XP needed per level = level * 100
         xp_needed = lvl * 100
@@ -539,9 +568,10 @@ class XPBar(pygame.Surface):
         # Draw text displaying level and XP
         lvl_str = f"Level {lvl}: {xp}/{xp_needed}"
         self.blit(
-            font.render(lvl_str, True, TEXT_COLOUR),
+            TextCache.render(font, lvl_str, True, TEXT_COLOUR),
             ((self.__width // 2) - (font.size(lvl_str)[0] // 2), (self.__height // 2) - (font.size(lvl_str)[1] // 2))
         )
+        return True
 
 
 class SkillTree(pygame.Surface):
@@ -552,8 +582,8 @@ class SkillTree(pygame.Surface):
         super().__init__((self.__width, self.__height), pygame.SRCALPHA)
         img_dims = int((window_height / 720) * 50)
         self.__levels, self.__level_rects = self.__load_levels(DataLoader.tree_root, DataLoader.player_data["class"], img_dims)
-        self.__imgs = [pygame.image.load(f"{MAIN_ASSET_PATH}{i['elem'].tag}.png") for i in self.__levels]
-        self.__bw_imgs = [pygame.image.load(f"{MAIN_ASSET_PATH}{i['elem'].tag}_bw.png") for i in self.__levels]
+        self.__imgs = [AssetManager.get(i["elem"].tag) for i in self.__levels]
+        self.__bw_imgs = [AssetManager.get(f"{i['elem'].tag}_bw") for i in self.__levels]
         self.__lines = self.__get_lines(img_dims)
 
     def __getitem__(self, item):
@@ -684,7 +714,7 @@ class SkillTree(pygame.Surface):
 
         # Draw skill point text
         self.blit(
-            font.render(text, True, TEXT_COLOUR),
+            TextCache.render(font, text, True, TEXT_COLOUR),
             ((self.__width // 2) - (font.size(text)[0] // 2), self.__height - font.size(text)[1])
         )
 
@@ -708,6 +738,7 @@ class ItemDropDisplay(pygame.Surface):
         self.__width = WINDOW_WIDTH // 2
         self.__height = WINDOW_HEIGHT // 2
         self.__items = []
+        self.__drawn_font = None
 
     @property
     def width(self):
@@ -724,13 +755,18 @@ class ItemDropDisplay(pygame.Surface):
         :return: None
         """
         self.__items.insert(0, item)
+        self.__drawn_font = None
 
-    def update(self, font: pygame.font) -> None:
+    def update(self, font: pygame.font) -> bool:
         """
-        Updates ItemDropDisplay surface each frame
+        Updates ItemDropDisplay surface, the surface is only redrawn if an item was added
         :param font: Font in which the text should be written in
-        :return: None
+        :return: True if the surface was redrawn
         """
+        if font is self.__drawn_font:
+            return False
+        self.__drawn_font = font
+
         self.fill(ITEM_DROP_DISPLAY_BACKGROUND)
 
         for pos, item in enumerate(self.__items):
@@ -753,9 +789,10 @@ class ItemDropDisplay(pygame.Surface):
 
             # Draw item name text
             self.blit(
-                font.render(item[0], True, TEXT_COLOUR),
+                TextCache.render(font, item[0], True, TEXT_COLOUR),
                 (self.width - item[1].get_width() - str_width, (pos * item[1].get_height()) + (str_height // 2))
             )
+        return True
 
 
 class Menu(pygame.Surface):
@@ -799,10 +836,65 @@ class Menu(pygame.Surface):
             pygame.draw.rect(self, MENU_BUTTON_COLOUR, bp)
             if bp == focused_rect:
                 pygame.draw.rect(self, MENU_SELECTED, bp, 4)
-            txt = font.render(b[0], True, TEXT_COLOUR)
+            txt = TextCache.render(font, b[0], True, TEXT_COLOUR)
             txt_size = font.size(b[0])
             self.blit(txt, ((self.__width // 2) - (txt_size[0] // 2), bp.y + (bp.h // 2) - (txt_size[1] // 2)))
 
 
+class ProfilerOverlay(pygame.Surface):
+    """Shows the p50, p95 and p99 time of each game loop phase and a histogram of frame times"""
+    def __init__(self):
+        super().__init__((PROFILER_WIDTH, PROFILER_HEIGHT), pygame.SRCALPHA)
+        self.__width = PROFILER_WIDTH
+        self.__height = PROFILER_HEIGHT
+        self.__frames_since_drawn = PROFILER_REFRESH
+
+    @property
+    def width(self):
+        return self.__width
+
+    @property
+    def height(self):
+        return self.__height
+
+    def update(self, font: pygame.font) -> bool:
+        """
+        Updates the overlay, it is only redrawn every PROFILER_REFRESH frames so it doesn't show up in the timings itself
+        :param font: Font to be used to render the text, should be monospaced so the columns line up
+        :return: True if the surface was redrawn
+        """
+        self.__frames_since_drawn += 1
+        if self.__frames_since_drawn < PROFILER_REFRESH:
+            return False
+        self.__frames_since_drawn = 0
+
+        self.fill(PROFILER_BACKGROUND)
+
+        # Table of phase timings in milliseconds
+        line_height = font.get_linesize()
+        rows = [f"{'phase':<12}{'p50':>8}{'p95':>8}{'p99':>8}"] + [
+            f"{phase:<12}" + "".join(f"{ms:>8.2f}" for ms in Profiler.percentiles(phase))
+            for phase in Profiler.phases()
+        ]
+        for pos, row in enumerate(rows):
+            self.blit(TextCache.render_glyphs(font, row, True, PROFILER_TEXT_COLOUR), (5, 5 + pos * line_height))
+
+        # Histogram of whole frame times, the red line is the time a frame has at MAX_FRAME_RATE
+        budget = 1000 / MAX_FRAME_RATE
+        graph = pygame.Rect(5, 10 + len(rows) * line_height, self.__width - 10, 0)
+        graph.height = self.__height - graph.y - 5
+        if graph.height > 0 and Profiler.frames():
+            limit = max(Profiler.percentiles("frame", (99,))[0], budget * 2)
+            counts, _ = Profiler.histogram("frame", graph.width // 10, limit)
+            highest = max(counts) or 1
+            bar_width = graph.width / len(counts)
+            for i, count in enumerate(counts):
+                bar_height = graph.height * (count / highest)
+                pygame.draw.rect(self, PROFILER_BAR_COLOUR, (graph.x + i * bar_width, graph.bottom - bar_height, max(bar_width - 1, 1), bar_height))
+            budget_x = graph.x + graph.width * (budget / limit)
+            pygame.draw.line(self, PROFILER_BUDGET_COLOUR, (budget_x, graph.y), (budget_x, graph.bottom))
+        return True
+
+
 if __name__ == '__main__':
     pass
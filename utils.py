@@ -1,4 +1,6 @@
 import pygame
+import math
+import numpy as np
 from items import ItemDrop
 from typing import Iterable, Union
 from constants import WINDOW_HEIGHT
@@ -34,6 +36,10 @@ def line_collide(line_1_coords: Iterable, line_2_coords: Iterable) -> tuple:
         0.0 ≤ u ≤ 1.0
     if t or u is outside of this range then there is no collision
 
+    When the denominator is 0 the lines are parallel and only collide if they lie on top of each other,
+    the collision is then where they start to overlap along line 1
+    A line with no length is treated as a point, which collides if it lies on the other line
+
     :param line_1_coords: (x1, y1, x2, y2)
     :param line_2_coords: (x3, y3, x4, y4)
     :return: Collision coords
@@ -42,15 +48,133 @@ def line_collide(line_1_coords: Iterable, line_2_coords: Iterable) -> tuple:
     x1, y1, x2, y2 = line_1_coords
     x3, y3, x4, y4 = line_2_coords
 
-    # Calculating t and u
-    t = ((((x1 - x3) * (y3 - y4)) - ((y1 - y3) * (x3 - x4))) / (((x1 - x2) * (y3 - y4)) - ((y1 - y2) * (x3 - x4))))
-    u = -((((x1 - x2) * (y1 - y3)) - ((y1 - y2) * (x1 - x3))) / (((x1 - x2) * (y3 - y4)) - ((y1 - y2) * (x3 - x4))))
+    denom = ((x1 - x2) * (y3 - y4)) - ((y1 - y2) * (x3 - x4))
+    if denom != 0:
+        # Calculating t and u
+        t = ((((x1 - x3) * (y3 - y4)) - ((y1 - y3) * (x3 - x4))) / denom)
+        u = -((((x1 - x2) * (y1 - y3)) - ((y1 - y2) * (x1 - x3))) / denom)
+
+        # Calculating intersection coords
+        px = x1 + (t * (x2 - x1))
+        py = y1 + (t * (y2 - y1))
+
+        return (px, py) if 0.0 <= t <= 1.0 and 0.0 <= u <= 1.0 else False
+
+    len_1 = (x2 - x1) ** 2 + (y2 - y1) ** 2
+    len_2 = (x4 - x3) ** 2 + (y4 - y3) ** 2
+    if len_1 == 0:
+        # Line 1 is a point, it is on line 2 if it is in line with it and between its ends
+        if len_2 == 0:
+            return (x1, y1) if (x1, y1) == (x3, y3) else False
+        s = (((x1 - x3) * (x4 - x3)) + ((y1 - y3) * (y4 - y3))) / len_2
+        on_line = ((x1 - x3) * (y4 - y3)) - ((y1 - y3) * (x4 - x3)) == 0
+        return (x1, y1) if on_line and 0.0 <= s <= 1.0 else False
+
+    # Parallel lines which aren't on the same infinite line never meet
+    if ((x3 - x1) * (y2 - y1)) - ((y3 - y1) * (x2 - x1)) != 0:
+        return False
+
+    # Positions of the ends of line 2 along line 1, the lines overlap between lo and hi
+    t3 = (((x3 - x1) * (x2 - x1)) + ((y3 - y1) * (y2 - y1))) / len_1
+    t4 = (((x4 - x1) * (x2 - x1)) + ((y4 - y1) * (y2 - y1))) / len_1
+    lo, hi = max(min(t3, t4), 0.0), min(max(t3, t4), 1.0)
+    return (x1 + (lo * (x2 - x1)), y1 + (lo * (y2 - y1))) if lo <= hi else False
+
+
+def line_collide_batch(lines_1, lines_2) -> tuple:
+    """
+    line_collide for many pairs of lines at once, the arrays are broadcast against each other so
+    e.g rays[:, None] and walls[None, :] checks every ray against every wall
+    Parallel lines and lines with no length are handled the same way as line_collide
+    :param lines_1: Array of (x1, y1, x2, y2) with shape (..., 4)
+    :param lines_2: Array of (x3, y3, x4, y4) with shape (..., 4)
+    :return: (hit, t, points) where hit is a bool array, t is how far along line 1 each collision is from 0 to 1
+             and points are the (x, y) collision coords, t and points are nan where there isn't a collision
+    """
+    lines_1 = np.asarray(lines_1, dtype=float)
+    lines_2 = np.asarray(lines_2, dtype=float)
+    p1, d1 = lines_1[..., :2], lines_1[..., 2:] - lines_1[..., :2]
+    p3, d2 = lines_2[..., :2], lines_2[..., 2:] - lines_2[..., :2]
+    r = p3 - p1
+
+    def cross(a, b):
+        return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+    def dot(a, b):
+        return a[..., 0] * b[..., 0] + a[..., 1] * b[..., 1]
 
-    # Calculating intersection coords
-    px = x1 + (t * (x2 - x1))
-    py = y1 + (t * (y2 - y1))
+    denom = cross(d1, d2)
+    r_d1, r_d2 = cross(r, d1), cross(r, d2)
+    len_1, len_2 = dot(d1, d1), dot(d2, d2)
 
-    return (px, py) if 0.0 <= t <= 1.0 and 0.0 <= u <= 1.0 else False
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Lines which cross at one point
+        t = r_d2 / denom
+        u = r_d1 / denom
+        crossing = (denom != 0) & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+
+        # Parallel lines on the same infinite line, they overlap between lo and hi along line 1
+        t3 = dot(r, d1) / len_1
+        t4 = dot(r + d2, d1) / len_1
+        lo = np.maximum(np.minimum(t3, t4), 0)
+        overlapping = (denom == 0) & (len_1 > 0) & (r_d1 == 0) & (lo <= np.minimum(np.maximum(t3, t4), 1))
+
+        # Line 1 is a point on line 2
+        s = -dot(r, d2) / len_2
+        on_line = (len_1 == 0) & np.where(len_2 > 0, (r_d2 == 0) & (s >= 0) & (s <= 1), (r == 0).all(axis=-1))
+
+    t = np.where(crossing, t, np.where(overlapping, lo, np.where(on_line, 0.0, np.nan)))
+    return crossing | overlapping | on_line, t, p1 + t[..., None] * d1
+
+
+def sector_rect_collide(sector: tuple, r: pygame.Rect) -> bool:
+    """
+    Checks if a sector of a circle overlaps a rect
+    The rect is clipped to the wedge between the sector's two straight sides, the sector and rect then overlap
+    if any of what is left of the rect is within the radius of the centre
+    Angles are anticlockwise from the right with y pointing up like pygame.draw.arc, so points on the circle are:
+        (x, y) = (cx + (r * cos(angle)), cy - (r * sin(angle)))
+    :param sector: (cx, cy, radius, start angle, end angle) with the angles in radians
+    :param r: Rect to check
+    :return: True if collided, False if not
+    """
+    cx, cy, radius, start, end = sector
+    # Rects which are out of reach of the whole circle can't overlap the sector
+    nearest_x, nearest_y = min(max(cx, r.left), r.right), min(max(cy, r.top), r.bottom)
+    if (nearest_x - cx) ** 2 + (nearest_y - cy) ** 2 > radius * radius:
+        return False
+
+    if end - start > math.pi:
+        # The wedge is only convex up to half a circle so larger sectors are checked in two halves
+        mid = (start + end) / 2
+        return sector_rect_collide((cx, cy, radius, start, mid), r) or sector_rect_collide((cx, cy, radius, mid, end), r)
+
+    # Corners relative to the centre with y pointing up, so the wedge is anticlockwise from start to end
+    polygon = [(x - cx, cy - y) for x, y in get_rect_corners(r)]
+    for angle, side in ((start, 1), (end, -1)):
+        # Keep the part of the rect on the inside of this side of the wedge, using the sign of the cross product
+        dx, dy = math.cos(angle), math.sin(angle)
+        clipped = []
+        for i, (x, y) in enumerate(polygon):
+            px, py = polygon[i - 1]
+            f, pf = side * ((dx * y) - (dy * x)), side * ((dx * py) - (dy * px))
+            if (f >= 0) != (pf >= 0):
+                clipped.append((px + ((x - px) * pf / (pf - f)), py + ((y - py) * pf / (pf - f))))
+            if f >= 0:
+                clipped.append((x, y))
+        polygon = clipped
+        if not polygon:
+            return False
+
+    # The centre is the corner of the wedge so it is never inside what is left, the closest point is on an edge
+    for i, (x, y) in enumerate(polygon):
+        px, py = polygon[i - 1]
+        ex, ey = x - px, y - py
+        length_sq = (ex * ex) + (ey * ey)
+        t = 0 if length_sq == 0 else min(max(-((px * ex) + (py * ey)) / length_sq, 0), 1)
+        if (px + (t * ex)) ** 2 + (py + (t * ey)) ** 2 <= radius * radius:
+            return True
+    return False
 
 
 def colour_lerp(a: Union[tuple, list], b: Union[tuple, list], num_of_cols: int) -> tuple:
@@ -122,36 +246,32 @@ def st_collide(st: SkillTree, mx: int, my: int) -> tuple:
             return space
 
 
-def bullet_collide(b, board: Board, player, enemies: list) -> bool:
+def bullet_collide(b: pygame.Rect, from_enemy: bool, damage: int, board: Board, player, enemies: list, dx: float=0, dy: float=0) -> bool:
     """
-    Checks if the bullet has collided with any surfaces
-    :param b: Bullet object to check collision with
+    Checks if the bullet has collided with any surfaces, walls are checked along the whole of its next move
+    :param b: Rect of the bullet in world coordinates
+    :param from_enemy: True if the bullet was fired by an enemy
+    :param damage: Damage the bullet deals
     :param board: Board object that the bullet is being drawn to
     :param player: Player object to check collision on
-    :param enemies: All enemies currently alive
+    :param enemies: Enemies to check, e.g those near the bullet
+    :param dx: Amount the bullet will move right
+    :param dy: Amount the bullet will move down
     :return: True if collided, False if not
     """
-    adjusted_b = pygame.Rect(b.x + board.x, b.y + board.y, b.w, b.h)
-    if b.from_enemy:
+    if from_enemy:
         pl_rect = pygame.Rect(player.x + (player.width // 2), player.y + (player.height // 2), player.width, player.height)
-        if adjusted_b.colliderect(pl_rect):
-            player.health -= b.damage
+        if b.colliderect(pl_rect):
+            player.health -= damage
             return True
     else:
         for e in enemies:
             e_rect = pygame.Rect(e.x + (e.width // 2), e.y + (e.height // 2), e.width, e.height)
-            if adjusted_b.colliderect(e_rect):
-                e.health -= b.damage
+            if b.colliderect(e_rect):
+                e.health -= damage
                 return True
 
-    for vws, hws, vds, hds in zip(board.vert_wall_pos, board.hori_wall_pos, board.vert_door_pos, board.hori_door_pos):
-        for vw, hw, vd, hd in zip(vws, hws, vds, hds):
-            if b.colliderect(vw) or b.colliderect(hw):
-                if (b.colliderect(vd) and vd.open_) or (b.colliderect(hd) and hd.open_):
-                    return False
-                else:
-                    return True
-    return False
+    return board.raycast(b, dx, dy) is not None
 
 
 def get_rect_corners(r: pygame.Rect) -> list:
@@ -168,13 +288,13 @@ def get_rect_corners(r: pygame.Rect) -> list:
     ]
 
 
-def kill_enemy(enemies: list, index: int, board: Board, item_drops: list) -> list:
+def kill_enemy(enemies: list, index: int, item_drops: list, time: float=0) -> list:
     """
     Kills the enemy provided and gets loot drop
     :param enemies: List of all enemies currently alive
     :param index: Index in enemies list of the enemy to kill
-    :param board: Board object
     :param item_drops: List of all item drops currently on the board
+    :param time: Game time in milliseconds, the drop's pickup animation starts from it
     :return: Updated item_drops list
     """
     drop_data = enemies[index].kill()
@@ -182,8 +302,7 @@ def kill_enemy(enemies: list, index: int, board: Board, item_drops: list) -> lis
 
     if drop_data is not None:
         DataLoader.change_file("add_xp", drop_data[3])
-        drop_data = drop_data[0] - board.x, drop_data[1] - board.y, drop_data[2]
-        item_drops.append(ItemDrop(*drop_data))
+        item_drops.append(ItemDrop(*drop_data[:3], time))
         return item_drops
 
 